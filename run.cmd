@@ -93,6 +93,6 @@ if errorlevel 1 (
   exit /b 1
 )
 
-echo [DONE] check results\YYYYMMDD_HHMM\
+echo [DONE] check results\YYYYMMDD_HHMMSS_xxxxxx\
 pause
 endlocal
@@ -1,21 +1,103 @@
 from __future__ import annotations
 
 import argparse
+import sys
 
-from .runner import run_benchmark
+from . import commands
 
+# NOTE: keep this module light. Heavy modules (runner, backends, openpyxl, requests)
+# are imported only by the command that needs them (see commands.py).
 
-def main() -> None:
-    parser = argparse.ArgumentParser(prog="obrbr", description="Offline RAG Benchmark Runner")
-    parser.add_argument(
+
+def _add_config_arg(p: argparse.ArgumentParser, default: object) -> None:
+    p.add_argument(
         "--config",
         "-c",
-        required=True,
+        default=default,
         help="Path to bench.yaml (e.g. configs\\bench.yaml)",
     )
-    args = parser.parse_args()
-    run_benchmark(config_path=args.config)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="obrbr", description="Offline RAG Benchmark Runner")
+    _add_config_arg(parser, default=None)
+
+    sub = parser.add_subparsers(dest="command")
+    # Sub-command --config uses SUPPRESS so `obrbr -c x run` and `obrbr run -c x` both work.
+    _add_config_arg(sub.add_parser("run", help="Run benchmark (default)"), argparse.SUPPRESS)
+    _add_config_arg(
+        sub.add_parser("validate", help="Parse and check bench.yaml without running"),
+        argparse.SUPPRESS,
+    )
+
+    p_cmp = sub.add_parser("compare", help="Diff two recorded runs from the run history")
+    _add_config_arg(p_cmp, argparse.SUPPRESS)
+    p_cmp.add_argument("--db", default="", help="Run-history sqlite (default: run.history_db)")
+    p_cmp.add_argument("--base", default="", help="Base run id (default: oldest in window)")
+    p_cmp.add_argument("--new", default="", help="New run id (default: newest in window)")
+    p_cmp.add_argument("--since", default="", help="Window start, ISO date/time prefix")
+    p_cmp.add_argument("--until", default="", help="Window end (inclusive), ISO prefix")
+    p_cmp.add_argument(
+        "--recall-threshold", type=float, default=0.01, help="Max allowed recall drop (abs)"
+    )
+    p_cmp.add_argument(
+        "--latency-threshold", type=float, default=0.10, help="Max allowed latency rise (rel)"
+    )
+    p_cmp.add_argument(
+        "--timeout-threshold", type=float, default=0.01, help="Max allowed timeout_rate rise (abs)"
+    )
+    p_cmp.add_argument("--regressions-only", action="store_true")
+    p_cmp.add_argument("--fail-on-regression", action="store_true", help="Exit 1 on regression")
+
+    p_gen = sub.add_parser("generate", help="Synthesize a large docs/queries workload")
+    p_gen.add_argument("--out-dir", required=True, help="Writes docs.jsonl + queries.jsonl here")
+    p_gen.add_argument("--docs", type=int, default=100_000)
+    p_gen.add_argument("--queries", type=int, default=1_000)
+    p_gen.add_argument("--labels", type=int, default=10_000, help="Label (answer_id) cardinality")
+    p_gen.add_argument("--dup-ratio", type=float, default=0.0, help="Exact duplicate doc ratio")
+    p_gen.add_argument("--near-dup-ratio", type=float, default=0.0, help="Near-duplicate ratio")
+    p_gen.add_argument("--truth-min", type=int, default=1, help="Min truth labels per query")
+    p_gen.add_argument("--truth-max", type=int, default=1, help="Max truth labels per query")
+    p_gen.add_argument("--seed", type=int, default=42)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "compare":
+        return commands.compare(
+            config_path=args.config or "",
+            db=args.db,
+            base=args.base,
+            new=args.new,
+            since=args.since,
+            until=args.until,
+            recall_threshold=args.recall_threshold,
+            latency_threshold=args.latency_threshold,
+            timeout_threshold=args.timeout_threshold,
+            regressions_only=args.regressions_only,
+            fail_on_regression=args.fail_on_regression,
+        )
+    if args.command == "generate":
+        return commands.generate(
+            out_dir=args.out_dir,
+            docs=args.docs,
+            queries=args.queries,
+            labels=args.labels,
+            dup_ratio=args.dup_ratio,
+            near_dup_ratio=args.near_dup_ratio,
+            truth_min=args.truth_min,
+            truth_max=args.truth_max,
+            seed=args.seed,
+        )
+    if not args.config:
+        parser.error("--config is required")
+
+    if args.command == "validate":
+        return commands.validate(args.config)
+    return commands.run(args.config)
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -1,17 +1,93 @@
 import typer
 
-from .runner import run_benchmark
+from . import commands
 
 app = typer.Typer(add_completion=False, help="Offline RAG Benchmark Runner")
 
 
 @app.callback(invoke_without_command=True)
 def main(
-    config: str = typer.Option(..., "--config", "-c", help="Path to bench.yaml"),
+    ctx: typer.Context,
+    config: str = typer.Option(None, "--config", "-c", help="Path to bench.yaml"),
 ) -> None:
     """
     Run benchmark (single-command style).
     Usage:
       python -m obrbr --config configs\\bench.yaml
     """
-    run_benchmark(config_path=config)
+    if ctx.invoked_subcommand is not None:
+        return
+    if not config:
+        raise typer.BadParameter("--config is required", param_hint="--config")
+
+    raise typer.Exit(code=commands.run(config))
+
+
+@app.command()
+def validate(
+    config: str = typer.Option(..., "--config", "-c", help="Path to bench.yaml"),
+) -> None:
+    """Parse and check bench.yaml without loading backends."""
+    raise typer.Exit(code=commands.validate(config))
+
+
+@app.command()
+def compare(
+    config: str = typer.Option("", "--config", "-c", help="Path to bench.yaml"),
+    db: str = typer.Option("", help="Run-history sqlite (default: run.history_db)"),
+    base: str = typer.Option("", help="Base run id (default: oldest in window)"),
+    new: str = typer.Option("", help="New run id (default: newest in window)"),
+    since: str = typer.Option("", help="Window start, ISO date/time prefix"),
+    until: str = typer.Option("", help="Window end (inclusive), ISO prefix"),
+    recall_threshold: float = typer.Option(0.01, help="Max allowed recall drop (abs)"),
+    latency_threshold: float = typer.Option(0.10, help="Max allowed latency rise (rel)"),
+    timeout_threshold: float = typer.Option(0.01, help="Max allowed timeout_rate rise (abs)"),
+    regressions_only: bool = typer.Option(False, "--regressions-only"),
+    fail_on_regression: bool = typer.Option(
+        False, "--fail-on-regression", help="Exit 1 on regression"
+    ),
+) -> None:
+    """Compare two recorded runs from the run history."""
+    raise typer.Exit(
+        code=commands.compare(
+            config_path=config,
+            db=db,
+            base=base,
+            new=new,
+            since=since,
+            until=until,
+            recall_threshold=recall_threshold,
+            latency_threshold=latency_threshold,
+            timeout_threshold=timeout_threshold,
+            regressions_only=regressions_only,
+            fail_on_regression=fail_on_regression,
+        )
+    )
+
+
+@app.command()
+def generate(
+    out_dir: str = typer.Option(..., help="Writes docs.jsonl + queries.jsonl here"),
+    docs: int = typer.Option(100_000),
+    queries: int = typer.Option(1_000),
+    labels: int = typer.Option(10_000, help="Label (answer_id) cardinality"),
+    dup_ratio: float = typer.Option(0.0, help="Exact duplicate doc ratio"),
+    near_dup_ratio: float = typer.Option(0.0, help="Near-duplicate ratio"),
+    truth_min: int = typer.Option(1, help="Min truth labels per query"),
+    truth_max: int = typer.Option(1, help="Max truth labels per query"),
+    seed: int = typer.Option(42),
+) -> None:
+    """Write a synthetic docs/queries workload for scale tests."""
+    raise typer.Exit(
+        code=commands.generate(
+            out_dir=out_dir,
+            docs=docs,
+            queries=queries,
+            labels=labels,
+            dup_ratio=dup_ratio,
+            near_dup_ratio=near_dup_ratio,
+            truth_min=truth_min,
+            truth_max=truth_max,
+            seed=seed,
+        )
+    )
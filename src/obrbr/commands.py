@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import os
+import sys
+
+# Command implementations shared by both entry points (argparse `__main__` and typer `cli`).
+# Each returns a process exit code. Keep this module light: heavy modules (runner, backends,
+# openpyxl, requests) are imported inside the command that needs them.
+
+
+def run(config_path: str) -> int:
+    from .runner import run_benchmark
+
+    run_benchmark(config_path=config_path)
+    return 0
+
+
+def validate(config_path: str) -> int:
+    from .config import load_config, validate_config
+
+    try:
+        cfg = load_config(config_path)
+    except (OSError, ValueError) as e:
+        print(f"[INVALID] {config_path}: {e}", file=sys.stderr)
+        return 1
+
+    problems = validate_config(cfg)
+    if problems:
+        for p in problems:
+            print(f"[INVALID] {p}", file=sys.stderr)
+        return 1
+
+    print(
+        f"[OK] {config_path}: {len(cfg.indices)} indices x {len(cfg.models)} models, "
+        f"k_list={cfg.run.k_list}, report_formats={cfg.run.report_formats}"
+    )
+    return 0
+
+
+def compare(
+    config_path: str = "",
+    db: str = "",
+    base: str = "",
+    new: str = "",
+    since: str = "",
+    until: str = "",
+    recall_threshold: float = 0.01,
+    latency_threshold: float = 0.10,
+    timeout_threshold: float = 0.01,
+    regressions_only: bool = False,
+    fail_on_regression: bool = False,
+) -> int:
+    from .history import compare_runs, list_runs
+    from .reporting import render_summary_table_md
+
+    db_path = db
+    if not db_path:
+        if not config_path:
+            print("[ERROR] compare needs --db or --config", file=sys.stderr)
+            return 2
+        from .config import load_config
+
+        db_path = load_config(config_path).run.history_db
+    if not db_path or not os.path.isfile(db_path):
+        print(f"[ERROR] run history not found: {db_path!r}", file=sys.stderr)
+        return 2
+
+    runs = {r.run_id: r for r in list_runs(db_path)}
+    window = list_runs(db_path, since=since, until=until)
+    base_id = base or (window[0].run_id if len(window) >= 2 else "")
+    new_id = new or (window[-1].run_id if window else "")
+    if not base_id or not new_id:
+        print(
+            f"[ERROR] need two runs to compare ({len(window)} in window); use --base/--new",
+            file=sys.stderr,
+        )
+        return 2
+    for rid in (base_id, new_id):
+        if rid not in runs:
+            print(f"[ERROR] run not found in history: {rid!r}", file=sys.stderr)
+            return 2
+
+    base_run, new_run = runs[base_id], runs[new_id]
+    print(f"- base: {base_run.run_id} ({base_run.started_at}, config={base_run.fingerprint})")
+    print(f"- new:  {new_run.run_id} ({new_run.started_at}, config={new_run.fingerprint})")
+    if base_run.fingerprint != new_run.fingerprint:
+        print("- note: config fingerprints differ")
+
+    rows = compare_runs(
+        db_path,
+        base_id,
+        new_id,
+        recall_drop=recall_threshold,
+        latency_rise=latency_threshold,
+        timeout_rise=timeout_threshold,
+    )
+    regressions = [r for r in rows if r["regression"]]
+    print()
+    print(render_summary_table_md(regressions if regressions_only else rows))
+    print()
+    print(f"Regressions: {len(regressions)}")
+    return 1 if regressions and fail_on_regression else 0
+
+
+def generate(
+    out_dir: str,
+    docs: int = 100_000,
+    queries: int = 1_000,
+    labels: int = 10_000,
+    dup_ratio: float = 0.0,
+    near_dup_ratio: float = 0.0,
+    truth_min: int = 1,
+    truth_max: int = 1,
+    seed: int = 42,
+) -> int:
+    from .workload import WorkloadSpec, generate_workload
+
+    spec = WorkloadSpec(
+        docs=docs,
+        queries=queries,
+        labels=labels,
+        dup_ratio=dup_ratio,
+        near_dup_ratio=near_dup_ratio,
+        truth_min=truth_min,
+        truth_max=truth_max,
+        seed=seed,
+    )
+    try:
+        docs_path, queries_path = generate_workload(spec, out_dir)
+    except ValueError as e:
+        print(f"[ERROR] {e}", file=sys.stderr)
+        return 2
+    print(f"[OK] docs: {docs_path} ({spec.docs})")
+    print(f"[OK] queries: {queries_path} ({spec.queries})")
+    return 0
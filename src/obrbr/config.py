@@ -1,10 +1,16 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
 from typing import Any
 
 import yaml
 
+# Report writers the runner knows about (run.report_formats).
+REPORT_FORMATS = ("xlsx", "md", "npz")
+
 
 @dataclass
 class EmbeddingCfg:
@@ -32,6 +38,7 @@ class IndexCfg:
     label_field: str = "answer_id"
     doc_text_field = str = "question"
     doc_vector: EmbeddingCfg | None = None
+    filter_fields: list[str] = field(default_factory=list)  # bitmap-indexed by local backends
 
     # elasticsearch options (optional)
     es_url: str = ""
@@ -40,6 +47,12 @@ class IndexCfg:
     es_auth_pass: str = ""
     es_verify_tls: bool = True
     es_use_knn: bool = True
+    es_timeout_sec: float = 30.0
+    es_max_retries: int = 3
+    es_backoff_base_sec: float = 0.2
+    es_backoff_max_sec: float = 5.0
+    es_pool_maxsize: int = 4
+    es_label_docvalues: bool = True  # read label via docvalue_fields (keyword) instead of _source
 
 
 @dataclass
@@ -48,12 +61,18 @@ class RunCfg:
     k_list: list[int]
     topn: int = 10
     fail_fast: bool = False
+    report_formats: list[str] = field(default_factory=lambda: list(REPORT_FORMATS))
+    history_db: str = ""  # sqlite run-history path; "" disables history
+    progress_interval_sec: float = 5.0  # progress log/jsonl cadence; 0 = end of pair only
+    query_timeout_sec: float = 0.0  # per-query deadline (embed + search); 0 = none
+    hedge_after_sec: float = 0.0  # fire one duplicate request after this long; 0 = no hedging
 
 
 @dataclass
 class DataCfg:
     queries_path: str
     truth_key: str = "answer_ids"
+    filter_key: str = "filters"  # per-query {field: value | [values]} for filtered search
 
 
 @dataclass
@@ -78,17 +97,26 @@ def load_config(path: str) -> BenchCfg:
     project_name = _require(raw.get("project", {}), "name", "project")
 
     run_raw = _require(raw, "run", "root")
+    output_root = str(_require(run_raw, "output_root", "run"))
     run_cfg = RunCfg(
-        output_root=_require(run_raw, "output_root", "run"),
+        output_root=output_root,
         k_list=list(_require(run_raw, "k_list", "run")),
         topn=int(run_raw.get("topn", 10)),
         fail_fast=bool(run_raw.get("fail_fast", False)),
+        report_formats=[
+            str(x).lower() for x in run_raw.get("report_formats", list(REPORT_FORMATS))
+        ],
+        progress_interval_sec=float(run_raw.get("progress_interval_sec", 5.0)),
+        query_timeout_sec=float(run_raw.get("query_timeout_sec", 0.0)),
+        hedge_after_sec=float(run_raw.get("hedge_after_sec", 0.0)),
+        history_db=str(run_raw.get("history_db", os.path.join(output_root, "history.sqlite"))),
     )
 
     data_raw = _require(raw, "data", "root")
     data_cfg = DataCfg(
         queries_path=_require(data_raw, "queries_path", "data"),
         truth_key=str(data_raw.get("truth_key", "answer_ids")),
+        filter_key=str(data_raw.get("filter_key", "filters")),
     )
 
     models_raw = _require(raw, "models", "root")
@@ -126,15 +154,77 @@ def load_config(path: str) -> BenchCfg:
                 id_field=str(idx.get("id_field", "doc_id")),
                 label_field=str(idx.get("label_field", "answer_id")),
                 doc_vector=doc_vec_cfg,
+                filter_fields=[str(x) for x in idx.get("filter_fields", []) or []],
                 es_url=str(idx.get("es_url", "")),
                 es_index=str(idx.get("es_index", "")),
                 es_auth_user=str(idx.get("es_auth_user", "")),
                 es_auth_pass=str(idx.get("es_auth_pass", "")),
                 es_verify_tls=bool(idx.get("es_verify_tls", True)),
                 es_use_knn=bool(idx.get("es_use_knn", True)),
+                es_timeout_sec=float(idx.get("es_timeout_sec", 30.0)),
+                es_max_retries=int(idx.get("es_max_retries", 3)),
+                es_backoff_base_sec=float(idx.get("es_backoff_base_sec", 0.2)),
+                es_backoff_max_sec=float(idx.get("es_backoff_max_sec", 5.0)),
+                es_pool_maxsize=int(idx.get("es_pool_maxsize", 4)),
+                es_label_docvalues=bool(idx.get("es_label_docvalues", True)),
             )
         )
 
     return BenchCfg(
         project_name=project_name, run=run_cfg, data=data_cfg, models=models, indices=indices
     )
+
+
+def config_fingerprint(cfg: BenchCfg) -> str:
+    """
+    Short stable hash of everything that affects results (not where they are written),
+    so runs of the same setup can be grouped in the run history.
+    """
+    d = asdict(cfg)
+    for k in ("output_root", "report_formats", "history_db"):
+        d["run"].pop(k, None)
+    for idx in d["indices"]:
+        idx.pop("es_auth_pass", None)
+    blob = json.dumps(d, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+def validate_config(cfg: BenchCfg) -> list[str]:
+    """
+    Semantic checks beyond load_config (which only checks required keys).
+    Returns a list of problems; empty means OK. Does not import any backend module.
+    """
+    from .search import backend_names
+
+    problems: list[str] = []
+
+    if not cfg.run.k_list or any(int(k) <= 0 for k in cfg.run.k_list):
+        problems.append(f"run.k_list must be positive integers: {cfg.run.k_list}")
+    elif max(cfg.run.k_list) > cfg.run.topn:
+        problems.append(f"run.topn ({cfg.run.topn}) is smaller than max k ({max(cfg.run.k_list)})")
+
+    if cfg.run.query_timeout_sec < 0 or cfg.run.hedge_after_sec < 0:
+        problems.append("run.query_timeout_sec/hedge_after_sec must be >= 0")
+    elif 0 < cfg.run.query_timeout_sec <= cfg.run.hedge_after_sec:
+        problems.append("run.hedge_after_sec must be smaller than run.query_timeout_sec")
+
+    for fmt in cfg.run.report_formats:
+        if fmt not in REPORT_FORMATS:
+            problems.append(f"run.report_formats: unknown format '{fmt}'")
+
+    if not os.path.isfile(cfg.data.queries_path):
+        problems.append(f"data.queries_path not found: {cfg.data.queries_path}")
+
+    if not cfg.models:
+        problems.append("models: at least one model is required")
+
+    known = backend_names()
+    for idx in cfg.indices:
+        if idx.backend.lower() not in known:
+            problems.append(f"indices.{idx.name}: unknown backend '{idx.backend}'")
+        elif idx.backend.lower() == "mock" and not os.path.isfile(idx.docs_path):
+            problems.append(f"indices.{idx.name}: docs_path not found: {idx.docs_path}")
+        elif idx.backend.lower() == "elasticsearch" and not (idx.es_url and idx.es_index):
+            problems.append(f"indices.{idx.name}: es_url/es_index are required")
+
+    return problems
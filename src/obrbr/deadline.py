@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from dataclasses import dataclass
+from typing import Generic, TypeVar
+
+T = TypeVar("T")
+
+TIMEOUT = "timeout"
+
+
+@dataclass
+class Guarded(Generic[T]):
+    value: T | None
+    reason: str = ""  # "" = ok, "timeout" = deadline exceeded
+    hedged: bool = False
+
+
+class QueryGuard:
+    """
+    Per-query deadline + hedged request for a blocking call (embed + search).
+
+    `fn` receives the time left until the deadline (None if there is none) and must honor
+    it (cap its I/O, check it between chunks of CPU work) and stop with a timeout error.
+    A thread cannot be killed: an attempt that ignores its budget keeps running after the
+    guard has given up on it, competing for CPU/GIL with later queries.
+
+    - timeout_sec > 0: give up after this long and report reason="timeout" instead of raising.
+    - hedge_after_sec > 0: if the first attempt is still running after this long, fire one
+      duplicate and take whichever finishes first (cuts tail latency from slow outliers).
+    - both 0: the call runs inline, no threads involved.
+    Each attempt gets its own daemon thread, so the clock starts when the call really starts:
+    attempts abandoned by earlier queries never queue up in front of later ones.
+    Exceptions from the call propagate (only if every attempt failed).
+    """
+
+    def __init__(self, timeout_sec: float = 0.0, hedge_after_sec: float = 0.0):
+        self.timeout_sec = timeout_sec
+        self.hedge_after_sec = hedge_after_sec
+        self._threaded = timeout_sec > 0 or hedge_after_sec > 0
+
+    @staticmethod
+    def _start(fn: Callable[[float | None], T], remaining: float | None) -> Future[T]:
+        fut: Future[T] = Future()
+        fut.set_running_or_notify_cancel()
+
+        def target() -> None:
+            try:
+                fut.set_result(fn(remaining))
+            except BaseException as e:  # handed to the waiting caller
+                fut.set_exception(e)
+
+        threading.Thread(target=target, name="obrbr-query", daemon=True).start()
+        return fut
+
+    def run(self, fn: Callable[[float | None], T]) -> Guarded[T]:
+        if not self._threaded:
+            return Guarded(fn(None))
+
+        start = time.monotonic()
+        deadline = start + self.timeout_sec if self.timeout_sec > 0 else math.inf
+        hedge_at = start + self.hedge_after_sec if self.hedge_after_sec > 0 else math.inf
+
+        def remaining() -> float | None:
+            return None if deadline == math.inf else max(0.0, deadline - time.monotonic())
+
+        pending: set[Future[T]] = {self._start(fn, remaining())}
+        hedged = False
+        first_error: BaseException | None = None
+
+        while True:
+            wake = deadline if hedged else min(deadline, hedge_at)
+            timeout = None if wake == math.inf else max(0.0, wake - time.monotonic())
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for f in done:
+                pending.discard(f)
+                err = f.exception()
+                if err is None:
+                    return Guarded(f.result(), hedged=hedged)
+                first_error = first_error or err
+
+            if not pending and first_error is not None:
+                # every attempt failed: hedging is for slowness, not for errors
+                raise first_error
+
+            now = time.monotonic()
+            if now >= deadline:
+                return Guarded(None, reason=TIMEOUT, hedged=hedged)
+            if not hedged and now >= hedge_at:
+                pending.add(self._start(fn, remaining()))
+                hedged = True
@@ -4,8 +4,6 @@ import hashlib
 import math
 from dataclasses import dataclass
 
-import requests
-
 from .config import EmbeddingCfg
 
 
@@ -43,7 +41,7 @@ def local_hash_embed(text: str, dim: int, salt: str = "") -> list[float]:
 class Embedder:
     cfg: EmbeddingCfg
 
-    def embed(self, text: str) -> list[float]:
+    def embed(self, text: str, timeout: float | None = None) -> list[float]:
         p = self.cfg.provider.lower()
 
         if p == "local_hash":
@@ -52,14 +50,22 @@ class Embedder:
         if p == "http_or_local":
             if not self.cfg.base_url:
                 return local_hash_embed(text, dim=self.cfg.dim, salt=self.cfg.salt)
-            return self._embed_http(text)
+            return self._embed_http(text, timeout)
 
         raise ValueError(f"Unknown embedding provider: {self.cfg.provider}")
 
-    def _embed_http(self, text: str) -> list[float]:
+    def _embed_http(self, text: str, timeout: float | None = None) -> list[float]:
+        import requests  # lazy: only HTTP-backed models need the HTTP stack
+
         url = self.cfg.base_url.rstrip("/") + self.cfg.endpoint_path
         payload = {"text": text, "dim": self.cfg.dim}
-        r = requests.post(url, json=payload, timeout=self.cfg.timeout_sec)
+        if timeout is None:
+            timeout = self.cfg.timeout_sec
+        else:  # query deadline caps the configured HTTP timeout
+            timeout = min(self.cfg.timeout_sec, timeout)
+            if timeout <= 0:
+                raise requests.Timeout("query deadline exceeded before embedding")
+        r = requests.post(url, json=payload, timeout=timeout)
         r.raise_for_status()
         data = r.json()
         vec = data.get("embedding")
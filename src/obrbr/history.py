@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import os
+import sqlite3
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# Run-history store (SQLite). One row per run in `runs`, one per (index, model) in `pairs`,
+# and summary metrics in long format in `metrics`, so new metric columns need no migration.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id       TEXT PRIMARY KEY,
+    project      TEXT NOT NULL,
+    started_at   TEXT NOT NULL,
+    config_path  TEXT NOT NULL,
+    fingerprint  TEXT NOT NULL,
+    out_dir      TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pairs (
+    run_id      TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    index_name  TEXT NOT NULL,
+    model       TEXT NOT NULL,
+    queries     INTEGER NOT NULL,
+    error       TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (run_id, index_name, model)
+);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id      TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    index_name  TEXT NOT NULL,
+    model       TEXT NOT NULL,
+    metric      TEXT NOT NULL,
+    value       REAL NOT NULL,
+    PRIMARY KEY (run_id, index_name, model, metric)
+);
+CREATE INDEX IF NOT EXISTS ix_runs_started ON runs(started_at);
+CREATE INDEX IF NOT EXISTS ix_metrics_pair ON metrics(index_name, model, metric);
+"""
+
+# Summary-row keys that are identifiers, not metrics.
+_NON_METRIC_KEYS = {"index", "model", "queries", "error"}
+
+
+@dataclass
+class RunInfo:
+    run_id: str
+    project: str
+    started_at: str
+    config_path: str
+    fingerprint: str
+    out_dir: str
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    if os.path.dirname(db_path):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def record_run(
+    db_path: str,
+    info: RunInfo,
+    summary_rows: Iterable[dict[str, object]],
+) -> None:
+    conn = connect(db_path)
+    try:
+        with conn:
+            # run_ids are unique per run; re-recording the same run_id replaces it (idempotent).
+            conn.execute("DELETE FROM runs WHERE run_id = ?", (info.run_id,))
+            conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    info.run_id,
+                    info.project,
+                    info.started_at,
+                    info.config_path,
+                    info.fingerprint,
+                    info.out_dir,
+                ),
+            )
+            for r in summary_rows:
+                idx_name, model = str(r.get("index", "")), str(r.get("model", ""))
+                conn.execute(
+                    "INSERT OR REPLACE INTO pairs VALUES (?, ?, ?, ?, ?)",
+                    (
+                        info.run_id,
+                        idx_name,
+                        model,
+                        int(r.get("queries", 0) or 0),
+                        str(r.get("error", "")),
+                    ),
+                )
+                conn.executemany(
+                    "INSERT OR REPLACE INTO metrics VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (info.run_id, idx_name, model, k, float(v))
+                        for k, v in r.items()
+                        if k not in _NON_METRIC_KEYS and isinstance(v, int | float)
+                    ],
+                )
+    finally:
+        conn.close()
+
+
+def list_runs(db_path: str, since: str = "", until: str = "") -> list[RunInfo]:
+    """Runs ordered by start time. since/until are ISO prefixes (e.g. '2026-10-01')."""
+    sql = "SELECT * FROM runs WHERE 1=1"
+    args: list[str] = []
+    if since:
+        sql += " AND started_at >= ?"
+        args.append(since)
+    if until:
+        # inclusive prefix bound: '2026-10-19' covers the whole day ('~' sorts after ISO chars)
+        sql += " AND started_at < ?"
+        args.append(until + "~")
+    sql += " ORDER BY started_at, run_id"
+    conn = connect(db_path)
+    try:
+        return [RunInfo(*row) for row in conn.execute(sql, args)]
+    finally:
+        conn.close()
+
+
+def load_run_metrics(db_path: str, run_id: str) -> dict[tuple[str, str], dict[str, float]]:
+    conn = connect(db_path)
+    try:
+        out: dict[tuple[str, str], dict[str, float]] = {}
+        for idx_name, model, metric, value in conn.execute(
+            "SELECT index_name, model, metric, value FROM metrics WHERE run_id = ?", (run_id,)
+        ):
+            out.setdefault((idx_name, model), {})[metric] = value
+        return out
+    finally:
+        conn.close()
+
+
+# Latency metrics gated by `latency_rise`; latency_max_ms is a single sample and too noisy.
+_LATENCY_GATED = {"latency_mean_ms", "latency_p50_ms", "latency_p95_ms", "latency_p99_ms"}
+
+
+def load_run_pairs(db_path: str, run_id: str) -> dict[tuple[str, str], str]:
+    """(index, model) -> error message ("" = the pair ran)."""
+    conn = connect(db_path)
+    try:
+        return {
+            (idx_name, model): error
+            for idx_name, model, error in conn.execute(
+                "SELECT index_name, model, error FROM pairs WHERE run_id = ?", (run_id,)
+            )
+        }
+    finally:
+        conn.close()
+
+
+def _status(pairs: dict[tuple[str, str], str], pair: tuple[str, str]) -> str:
+    if pair not in pairs:
+        return "missing"
+    return f"error: {pairs[pair]}" if pairs[pair] else "ok"
+
+
+def _is_regression(
+    metric: str,
+    base: float,
+    new: float,
+    recall_drop: float,
+    latency_rise: float,
+    timeout_rise: float,
+) -> bool:
+    if metric.startswith("recall@"):
+        return new < base - recall_drop
+    if metric in _LATENCY_GATED:
+        return base > 0 and new > base * (1.0 + latency_rise)
+    if metric == "timeout_rate":
+        return new > base + timeout_rise
+    if metric == "qps":
+        return base > 0 and new < base * (1.0 - latency_rise)
+    return False
+
+
+def compare_runs(
+    db_path: str,
+    base_run: str,
+    new_run: str,
+    recall_drop: float = 0.01,
+    latency_rise: float = 0.10,
+    timeout_rise: float = 0.01,
+) -> list[dict[str, object]]:
+    """
+    Diff two recorded runs per (index, model, metric).
+    - recall@k: regression if it drops by more than `recall_drop` (absolute)
+    - latency mean/p50/p95/p99: regression if it rises by more than `latency_rise` (relative)
+    - qps: regression if it drops by more than `latency_rise` (relative)
+    - timeout_rate: regression if it rises by more than `timeout_rise` (absolute)
+    - status: a pair that ran in base but failed or is missing in new (it has no metrics,
+      so no metric row above can flag it)
+    """
+    base = load_run_metrics(db_path, base_run)
+    new = load_run_metrics(db_path, new_run)
+    base_pairs = load_run_pairs(db_path, base_run)
+    new_pairs = load_run_pairs(db_path, new_run)
+
+    rows: list[dict[str, object]] = []
+    for pair in sorted(set(base) | set(new) | set(base_pairs) | set(new_pairs)):
+        b_status, n_status = _status(base_pairs, pair), _status(new_pairs, pair)
+        if b_status != n_status:
+            rows.append(
+                {
+                    "index": pair[0],
+                    "model": pair[1],
+                    "metric": "status",
+                    "base": b_status,
+                    "new": n_status,
+                    "delta": "",
+                    "regression": b_status == "ok",
+                }
+            )
+        b, n = base.get(pair, {}), new.get(pair, {})
+        for metric in sorted(set(b) | set(n)):
+            row: dict[str, object] = {"index": pair[0], "model": pair[1], "metric": metric}
+            row["base"] = b.get(metric, "")
+            row["new"] = n.get(metric, "")
+            if metric in b and metric in n:
+                row["delta"] = round(n[metric] - b[metric], 4)
+                row["regression"] = _is_regression(
+                    metric, b[metric], n[metric], recall_drop, latency_rise, timeout_rise
+                )
+            else:
+                row["delta"] = ""
+                row["regression"] = False
+            rows.append(row)
+    return rows
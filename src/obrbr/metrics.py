@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import math
 from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 
@@ -24,3 +25,26 @@ def recall_at_k(evals: Sequence[QueryEval], k: int) -> float:
 
 def recall_table(evals: Sequence[QueryEval], k_list: Iterable[int]) -> dict[int, float]:
     return {k: recall_at_k(evals, k) for k in k_list}
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """Nearest-rank percentile (p in [0, 100]). Returns 0.0 for empty input."""
+    if not values:
+        return 0.0
+    s = sorted(values)
+    rank = max(1, math.ceil(p / 100.0 * len(s)))
+    return s[min(rank, len(s)) - 1]
+
+
+def latency_summary(latencies_ms: Sequence[float]) -> dict[str, float]:
+    if not latencies_ms:
+        return {}
+    total = sum(latencies_ms)
+    return {
+        "latency_mean_ms": round(total / len(latencies_ms), 3),
+        "latency_p50_ms": round(percentile(latencies_ms, 50), 3),
+        "latency_p95_ms": round(percentile(latencies_ms, 95), 3),
+        "latency_p99_ms": round(percentile(latencies_ms, 99), 3),
+        "latency_max_ms": round(max(latencies_ms), 3),
+        "qps": round(len(latencies_ms) / (total / 1000.0), 3) if total > 0 else 0.0,
+    }
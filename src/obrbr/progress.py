@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TextIO
+
+
+@dataclass
+class ProgressReporter:
+    """
+    Live progress for long runs: queries done/total, QPS, ETA and running recall@k per
+    (index, model). Emitted at most every `interval_sec` to the logger and appended as a
+    JSON line to `path` (flushed each time so `tail -f` / dashboards see it immediately).
+    `qps` (and the ETAs) cover only the window since the previous emit; `qps_avg` is the
+    pair-wide average. While a pair is running (start_pair .. finish_pair) a daemon
+    heartbeat also emits when no query finishes, so a stall shows up as `qps=0` while it is
+    happening; between pairs (e.g. while the next backend loads) it stays quiet.
+    """
+
+    path: str
+    logger: logging.Logger
+    k_list: list[int]
+    total_queries: int  # across all (index, model) pairs
+    interval_sec: float = 5.0
+    clock: Callable[[], float] = time.monotonic
+    heartbeat: bool = True
+
+    def __post_init__(self) -> None:
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._fh: TextIO | None = open(self.path, "a", encoding="utf-8")
+        self._lock = threading.RLock()  # update() (runner thread) vs heartbeat thread
+        self.done_total = 0
+        self.start_pair("", "", 0)
+        self._active = False  # no pair running yet: heartbeat paused
+
+        self._stop = threading.Event()
+        self._beat: threading.Thread | None = None
+        if self.heartbeat and self.interval_sec > 0:
+            self._beat = threading.Thread(target=self._beat_loop, name="progress", daemon=True)
+            self._beat.start()
+
+    def _beat_loop(self) -> None:
+        while not self._stop.wait(self.interval_sec):
+            with self._lock:
+                if self._active and self._fh is not None and self._due():
+                    self.emit("progress")
+
+    def _due(self) -> bool:
+        return self.interval_sec > 0 and self.clock() - self._last_emit >= self.interval_sec
+
+    def start_pair(self, index: str, model: str, total: int) -> None:
+        with self._lock:
+            self._index, self._model = index, model
+            self._pair_total, self._pair_done = total, 0
+            self._hits = {k: 0 for k in self.k_list}
+            self._pair_started = self._last_emit = self.clock()
+            self._last_emit_done = 0
+            self._active = True
+
+    def update(self, ranked: Sequence[str], truth: set[str]) -> None:
+        with self._lock:
+            self._pair_done += 1
+            self.done_total += 1
+            for k in self.k_list:
+                if any(x in truth for x in ranked[:k]):
+                    self._hits[k] += 1
+            if self._due():
+                self.emit("progress")
+
+    def skip(self, n: int) -> None:
+        """Account for queries that will not run (e.g. failed pair) so overall ETA stays right."""
+        with self._lock:
+            self.done_total += n
+
+    def snapshot(self, event: str) -> dict[str, object]:
+        now = self.clock()
+        qps_avg = self._pair_done / max(now - self._pair_started, 1e-9)
+        window = now - self._last_emit
+        # windowed rate (current speed); an emit right after another has no window -> average
+        qps = (self._pair_done - self._last_emit_done) / window if window > 0 else qps_avg
+        remaining = self._pair_total - self._pair_done
+        run_remaining = self.total_queries - self.done_total
+        rec = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "event": event,
+            "index": self._index,
+            "model": self._model,
+            "done": self._pair_done,
+            "total": self._pair_total,
+            "qps": round(qps, 3),
+            "qps_avg": round(qps_avg, 3),
+            "eta_sec": round(remaining / qps, 1) if qps > 0 else None,
+            "run_done": self.done_total,
+            "run_total": self.total_queries,
+            "run_eta_sec": round(run_remaining / qps, 1) if qps > 0 else None,
+        }
+        for k in self.k_list:
+            rec[f"recall@{k}"] = (
+                round(self._hits[k] / self._pair_done, 4) if self._pair_done else 0.0
+            )
+        return rec
+
+    def finish_pair(self, event: str) -> dict[str, object]:
+        """Final record of the pair ("pair_done" / "pair_failed"); pauses the heartbeat."""
+        with self._lock:
+            self._active = False
+            return self._emit(event)
+
+    def emit(self, event: str) -> dict[str, object]:
+        with self._lock:
+            return self._emit(event)
+
+    def _emit(self, event: str) -> dict[str, object]:
+        rec = self.snapshot(event)
+        self._last_emit = self.clock()
+        self._last_emit_done = self._pair_done
+
+        pct = 100.0 * rec["done"] / rec["total"] if rec["total"] else 100.0
+        recall = ", ".join(f"R@{k}={rec[f'recall@{k}']}" for k in self.k_list)
+        self.logger.info(
+            f"Progress [{self._index}/{self._model}] {rec['done']}/{rec['total']} ({pct:.1f}%) "
+            f"qps={rec['qps']} (avg {rec['qps_avg']}) eta={rec['eta_sec']}s | run {rec['run_done']}/{rec['run_total']} "
+            f"eta={rec['run_eta_sec']}s | {recall}"
+        )
+        if self._fh is not None:
+            self._fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            self._fh.flush()
+        return rec
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._beat is not None:
+            self._beat.join()
+            self._beat = None
+        with self._lock:
+            if self._fh is not None:
+                self._fh.close()
+                self._fh = None
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import ast
+import glob
+import io
+import math
+import os
+import sys
+import zipfile
+from array import array
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+
+from .metrics import QueryEval, recall_table
+from .search.backend_base import SearchHit
+
+# Columnar per-query rankings for one (index, model) pair, stored as a NumPy-compatible
+# .npz (zip of .npy arrays) written with the stdlib only, so `numpy.load()` can read it
+# too but nothing here depends on numpy.
+#
+#   query_ids      <U*   (n,)          query ids
+#   labels         <U*   (L,)          label dictionary; label ids index into this
+#   label_ids      <i4   (n, topn)     ranked label ids, -1 = no hit
+#   scores         <f4   (n, topn)     ranked scores, NaN = no hit
+#   truth_offsets  <i4   (n + 1,)      CSR offsets into truth_ids
+#   truth_ids      <i4   (T,)          truth label ids (ragged per query)
+
+NPZ_SUFFIX = ".npz"
+_NPY_MAGIC = b"\x93NUMPY\x01\x00"
+_LITTLE = sys.byteorder == "little"
+
+
+@dataclass
+class RankingTable:
+    index: str
+    model: str
+    topn: int
+    query_ids: list[str] = field(default_factory=list)
+    labels: list[str] = field(default_factory=list)
+    label_ids: array = field(default_factory=lambda: array("i"))
+    scores: array = field(default_factory=lambda: array("f"))
+    truth_offsets: array = field(default_factory=lambda: array("i", [0]))
+    truth_ids: array = field(default_factory=lambda: array("i"))
+    _label_index: dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._label_index = {lab: i for i, lab in enumerate(self.labels)}
+
+    def __len__(self) -> int:
+        return len(self.query_ids)
+
+    def _label_id(self, label: str) -> int:
+        i = self._label_index.get(label)
+        if i is None:
+            i = len(self.labels)
+            self.labels.append(label)
+            self._label_index[label] = i
+        return i
+
+    def append(self, query_id: str, truth: Iterable[str], hits: Sequence[SearchHit]) -> None:
+        self.query_ids.append(query_id)
+        for i in range(self.topn):
+            if i < len(hits):
+                self.label_ids.append(self._label_id(hits[i].label))
+                self.scores.append(hits[i].score)
+            else:
+                self.label_ids.append(-1)
+                self.scores.append(math.nan)
+        for t in sorted(truth):
+            self.truth_ids.append(self._label_id(t))
+        self.truth_offsets.append(len(self.truth_ids))
+
+    def ranked_labels(self, row: int) -> list[str]:
+        base = row * self.topn
+        return [self.labels[i] for i in self.label_ids[base : base + self.topn] if i >= 0]
+
+    def truth(self, row: int) -> set[str]:
+        lo, hi = self.truth_offsets[row], self.truth_offsets[row + 1]
+        return {self.labels[i] for i in self.truth_ids[lo:hi]}
+
+    def to_evals(self) -> list[QueryEval]:
+        return [
+            QueryEval(query_id=qid, truth=self.truth(r), ranked_labels=self.ranked_labels(r))
+            for r, qid in enumerate(self.query_ids)
+        ]
+
+    def recall(self, k_list: Iterable[int]) -> dict[int, float]:
+        return recall_table(self.to_evals(), k_list)
+
+
+# ---- .npy encoding (format version 1.0) ----
+
+
+def _npy_bytes(descr: str, shape: tuple[int, ...], payload: bytes) -> bytes:
+    header = f"{{'descr': '{descr}', 'fortran_order': False, 'shape': {shape!r}, }}"
+    # magic(8) + len(2) + header + "\n" must be a multiple of 64
+    pad = 64 - (len(_NPY_MAGIC) + 2 + len(header) + 1) % 64
+    header = header + " " * (pad % 64) + "\n"
+    return _NPY_MAGIC + len(header).to_bytes(2, "little") + header.encode("latin1") + payload
+
+
+def _le_bytes(a: array) -> bytes:
+    if not _LITTLE:
+        a = array(a.typecode, a)
+        a.byteswap()
+    return a.tobytes()
+
+
+def _numeric_npy(a: array, shape: tuple[int, ...]) -> bytes:
+    descr = {"i": "<i4", "f": "<f4"}[a.typecode]
+    return _npy_bytes(descr, shape, _le_bytes(a))
+
+
+def _str_npy(values: Sequence[str]) -> bytes:
+    width = max([len(v) for v in values] + [1])
+    buf = io.BytesIO()
+    for v in values:
+        buf.write(v.encode("utf-32-le").ljust(width * 4, b"\x00"))
+    return _npy_bytes(f"<U{width}", (len(values),), buf.getvalue())
+
+
+def _parse_npy(raw: bytes) -> tuple[str, tuple[int, ...], bytes]:
+    if raw[:6] != _NPY_MAGIC[:6]:
+        raise ValueError("Not a .npy payload")
+    major = raw[6]
+    if major == 1:
+        hlen, start = int.from_bytes(raw[8:10], "little"), 10
+    else:
+        hlen, start = int.from_bytes(raw[8:12], "little"), 12
+    header = ast.literal_eval(raw[start : start + hlen].decode("latin1"))
+    if header.get("fortran_order"):
+        raise ValueError("fortran_order arrays are not supported")
+    return header["descr"], tuple(header["shape"]), raw[start + hlen :]
+
+
+def _decode_numeric(descr: str, payload: bytes) -> array:
+    typecode = {"<i4": "i", "<f4": "f"}.get(descr)
+    if typecode is None:
+        raise ValueError(f"Unsupported dtype: {descr}")
+    a = array(typecode)
+    a.frombytes(payload)
+    if not _LITTLE:
+        a.byteswap()
+    return a
+
+
+def _decode_str(descr: str, shape: tuple[int, ...], payload: bytes) -> list[str]:
+    if not descr.startswith("<U"):
+        raise ValueError(f"Unsupported dtype: {descr}")
+    step = int(descr[2:]) * 4
+    n = shape[0] if shape else 0
+    return [payload[i * step : (i + 1) * step].decode("utf-32-le").rstrip("\x00") for i in range(n)]
+
+
+# ---- public API ----
+
+
+def rankings_path(out_dir: str, index: str, model: str) -> str:
+    return os.path.join(out_dir, "rankings", f"{index}__{model}{NPZ_SUFFIX}")
+
+
+def write_rankings(path: str, table: RankingTable) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    n, topn = len(table), table.topn
+    members = {
+        "meta": _str_npy([table.index, table.model]),
+        "query_ids": _str_npy(table.query_ids),
+        "labels": _str_npy(table.labels),
+        "label_ids": _numeric_npy(table.label_ids, (n, topn)),
+        "scores": _numeric_npy(table.scores, (n, topn)),
+        "truth_offsets": _numeric_npy(table.truth_offsets, (n + 1,)),
+        "truth_ids": _numeric_npy(table.truth_ids, (len(table.truth_ids),)),
+    }
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as zf:
+        for name, data in members.items():
+            zf.writestr(name + ".npy", data)
+
+
+def load_rankings(path: str) -> RankingTable:
+    with zipfile.ZipFile(path) as zf:
+        parsed = {
+            name[: -len(".npy")]: _parse_npy(zf.read(name))
+            for name in zf.namelist()
+            if name.endswith(".npy")
+        }
+
+    def _strs(key: str) -> list[str]:
+        descr, shape, payload = parsed[key]
+        return _decode_str(descr, shape, payload)
+
+    def _nums(key: str) -> tuple[array, tuple[int, ...]]:
+        descr, shape, payload = parsed[key]
+        return _decode_numeric(descr, payload), shape
+
+    index, model = _strs("meta")
+    label_ids, shape = _nums("label_ids")
+    return RankingTable(
+        index=index,
+        model=model,
+        topn=shape[1] if len(shape) == 2 else 0,
+        query_ids=_strs("query_ids"),
+        labels=_strs("labels"),
+        label_ids=label_ids,
+        scores=_nums("scores")[0],
+        truth_offsets=_nums("truth_offsets")[0],
+        truth_ids=_nums("truth_ids")[0],
+    )
+
+
+def load_run_rankings(out_dir: str) -> dict[tuple[str, str], RankingTable]:
+    """Load every (index, model) ranking table stored under a run directory."""
+    out: dict[tuple[str, str], RankingTable] = {}
+    for path in sorted(glob.glob(os.path.join(out_dir, "rankings", f"*{NPZ_SUFFIX}"))):
+        t = load_rankings(path)
+        out[(t.index, t.model)] = t
+    return out
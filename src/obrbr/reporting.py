@@ -2,11 +2,10 @@ from __future__ import annotations
 
 import os
 
-from openpyxl import Workbook
-from openpyxl.utils import get_column_letter
-
 
 def _autosize(ws) -> None:
+    from openpyxl.utils import get_column_letter
+
     for col in range(1, ws.max_column + 1):
         max_len = 0
         for row in range(1, ws.max_row + 1):
@@ -25,7 +24,7 @@ def _ordered_headers(rows: list[dict[str, object]]) -> list[str]:
     for r in rows:
         keys.update(r.keys())
 
-    preferred = ["index", "model", "queries", "winner", "error"]
+    preferred = ["index", "model", "metric", "base", "new", "delta", "queries", "winner", "error"]
     cols: list[str] = [k for k in preferred if k in keys]
 
     rest = sorted([k for k in keys if k not in cols])
@@ -50,6 +49,8 @@ def write_summary_xlsx(
     per_index_sheets: dict[str, list[dict[str, object]]],
     extra_sheets: dict[str, list[dict[str, object]]] | None = None,
 ) -> None:
+    from openpyxl import Workbook  # lazy: openpyxl is only needed when xlsx output is enabled
+
     os.makedirs(os.path.dirname(path), exist_ok=True)
 
     wb = Workbook()
@@ -2,19 +2,28 @@ from __future__ import annotations
 
 import json
 import os
+import sys
+import time
+import uuid
 from datetime import datetime
+from functools import partial
 
-from .config import BenchCfg, IndexCfg, load_config
+from .config import BenchCfg, config_fingerprint, load_config
+from .deadline import TIMEOUT, Guarded, QueryGuard
 from .embedder import Embedder
+from .history import RunInfo, record_run
 from .logging_utils import setup_logger
-from .metrics import QueryEval, recall_table
+from .metrics import QueryEval, latency_summary, recall_table
+from .progress import ProgressReporter
+from .rankings import RankingTable, rankings_path, write_rankings
 from .reporting import render_summary_table_md, write_summary_xlsx
-from .search import ElasticsearchBackend, MockBackend
-from .search.backend_base import SearchHit
+from .search import make_backend
+from .search.backend_base import Filters, SearchBackend, SearchHit, filter_value
 
 
-def _now_run_id() -> str:
-    return datetime.now().strftime("%Y%m%d_%H%M")
+def _new_run_id(now: datetime) -> str:
+    # Seconds + random suffix: back-to-back runs never share an out_dir or history key.
+    return f"{now:%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:6]}"
 
 
 def _read_queries(path: str) -> list[dict[str, object]]:
@@ -26,15 +35,6 @@ def _read_queries(path: str) -> list[dict[str, object]]:
     return out
 
 
-def _make_backend(idx: IndexCfg):
-    b = idx.backend.lower()
-    if b == "mock":
-        return MockBackend(idx)
-    if b == "elasticsearch":
-        return ElasticsearchBackend(idx)
-    raise ValueError(f"[{idx.name}] Unknown backend: {idx.backend}")
-
-
 def _truth_set(q: dict[str, object], truth_key: str) -> set[str]:
     v = q.get(truth_key, [])
     if isinstance(v, list):
@@ -42,6 +42,41 @@ def _truth_set(q: dict[str, object], truth_key: str) -> set[str]:
     return {str(v)}
 
 
+def _query_filters(q: dict[str, object], filter_key: str) -> Filters | None:
+    v = q.get(filter_key)
+    if not isinstance(v, dict) or not v:
+        return None
+    return {
+        str(f): [filter_value(x) for x in vals] if isinstance(vals, list) else [filter_value(vals)]
+        for f, vals in v.items()
+    }
+
+
+def _embed_and_search(
+    embedder: Embedder,
+    backend: SearchBackend,
+    question: str,
+    topn: int,
+    filters: Filters | None = None,
+    timeout: float | None = None,
+) -> list[SearchHit]:
+    """timeout: time left in the query deadline, shared by embedding and search."""
+    start = time.monotonic()
+    qv = embedder.embed(question, timeout=timeout)
+    if timeout is not None:
+        timeout = max(0.0, timeout - (time.monotonic() - start))
+    return backend.search(qv, topn=topn, filters=filters, timeout=timeout)
+
+
+def _is_timeout(e: BaseException) -> bool:
+    if isinstance(e, TimeoutError):
+        return True
+    # requests.Timeout (connect/read timeout, deadline-capped request); if requests was never
+    # imported, nothing in this run could have raised it
+    requests = sys.modules.get("requests")
+    return requests is not None and isinstance(e, requests.Timeout)
+
+
 def _ranked_labels(hits: list[SearchHit]) -> list[str]:
     return [h.label for h in hits]
 
@@ -66,7 +101,9 @@ def _top_deltas(
 def run_benchmark(config_path: str) -> None:
     cfg: BenchCfg = load_config(config_path)
 
-    run_id = _now_run_id()
+    now = datetime.now()
+    run_id = _new_run_id(now)
+    started_at = now.isoformat(timespec="seconds")
     out_dir = os.path.join(cfg.run.output_root, run_id)
     os.makedirs(out_dir, exist_ok=True)
 
@@ -83,84 +120,162 @@ def run_benchmark(config_path: str) -> None:
     per_index_sheets: dict[str, list[dict[str, object]]] = {}
     failures: list[str] = []
 
-    # ---- main loop: indices x models ----
-    for idx in cfg.indices:
-        logger.info(f"=== Index: {idx.name} (backend={idx.backend}) ===")
-
-        try:
-            backend = _make_backend(idx)
-        except Exception as e:
-            msg = f"[INDEX INIT FAIL] {idx.name}: {e}"
-            logger.exception(msg)
-            failures.append(msg)
-            if cfg.run.fail_fast:
-                raise
-            continue
-
-        for model_name, model_cfg in cfg.models.items():
-            logger.info(f"-- Model {model_name} --")
-            evals: list[QueryEval] = []
-            details_rows: list[dict[str, object]] = []
-
-            try:
-                embedder = Embedder(model_cfg.query_embedding)
-
-                for q in queries:
-                    qid = str(q.get("query_id", ""))
-                    question = str(q.get("question", ""))
-                    truth = _truth_set(q, cfg.data.truth_key)
-
-                    qvec = embedder.embed(question)
-                    hits = backend.search(qvec, topn=cfg.run.topn)
-                    ranked = _ranked_labels(hits)
-
-                    evals.append(QueryEval(query_id=qid, truth=truth, ranked_labels=ranked))
-
-                    row: dict[str, object] = {
-                        "query_id": qid,
-                        "question": question,
-                        "truth": ",".join(sorted(truth)),
-                    }
-
-                    for i in range(min(cfg.run.topn, len(hits))):
-                        row[f"rank_{i+1}_label"] = hits[i].label
-                        row[f"rank_{i+1}_score"] = round(hits[i].score, 6)
-
-                    for k in cfg.run.k_list:
-                        row[f"hit@{k}"] = any(x in truth for x in ranked[:k])
-
-                    details_rows.append(row)
-
-                rec = recall_table(evals, cfg.run.k_list)
-                summary: dict[str, object] = {
-                    "index": idx.name,
-                    "model": model_name,
-                    "queries": len(evals),
-                }
-                for k in cfg.run.k_list:
-                    summary[f"recall@{k}"] = round(rec[k], 4)
-
-                summary_rows.append(summary)
+    progress = ProgressReporter(
+        path=os.path.join(out_dir, "progress.jsonl"),
+        logger=logger,
+        k_list=cfg.run.k_list,
+        total_queries=len(queries) * len(cfg.models) * len(cfg.indices),
+        interval_sec=cfg.run.progress_interval_sec,
+    )
 
-                sheet_key = f"{idx.name}_{model_name}"
-                per_index_sheets[sheet_key] = details_rows
+    guard = QueryGuard(cfg.run.query_timeout_sec, cfg.run.hedge_after_sec)
 
-                logger.info(
-                    "Result: "
-                    + ", ".join([f"R@{k}={summary[f'recall@{k}']}" for k in cfg.run.k_list])
-                )
+    # ---- main loop: indices x models ----
+    try:
+        for idx in cfg.indices:
+            logger.info(f"=== Index: {idx.name} (backend={idx.backend}) ===")
 
+            try:
+                backend = make_backend(idx)
             except Exception as e:
-                msg = f"[RUN FAIL] index={idx.name}, model={model_name}: {e}"
+                msg = f"[INDEX INIT FAIL] {idx.name}: {e}"
                 logger.exception(msg)
                 failures.append(msg)
+                progress.skip(len(queries) * len(cfg.models))
                 if cfg.run.fail_fast:
                     raise
-                summary_rows.append(
-                    {"index": idx.name, "model": model_name, "queries": 0, "error": str(e)}
-                )
                 continue
 
+            for model_name, model_cfg in cfg.models.items():
+                logger.info(f"-- Model {model_name} --")
+                evals: list[QueryEval] = []
+                details_rows: list[dict[str, object]] = []
+                table = RankingTable(index=idx.name, model=model_name, topn=cfg.run.topn)
+                latencies_ms: list[float] = []
+                timeouts = 0
+                hedged = 0
+                progress.start_pair(idx.name, model_name, len(queries))
+                io_stats = getattr(backend, "stats", None)
+                if io_stats is not None:
+                    io_stats.reset()  # per-pair I/O counters (ES request/response sizes)
+
+                try:
+                    embedder = Embedder(model_cfg.query_embedding)
+
+                    for q in queries:
+                        qid = str(q.get("query_id", ""))
+                        question = str(q.get("question", ""))
+                        truth = _truth_set(q, cfg.data.truth_key)
+                        filters = _query_filters(q, cfg.data.filter_key)
+
+                        t0 = time.perf_counter()
+                        try:
+                            res = guard.run(
+                                partial(
+                                    _embed_and_search,
+                                    embedder,
+                                    backend,
+                                    question,
+                                    cfg.run.topn,
+                                    filters,
+                                )
+                            )
+                        except Exception as e:
+                            if not _is_timeout(e):
+                                raise
+                            # an I/O timeout is a slow query, not a broken pair (guard on or off)
+                            res = Guarded(None, reason=TIMEOUT)
+                        latency_ms = (time.perf_counter() - t0) * 1000.0
+                        # timed-out queries count as misses; their latency (~deadline) stays in the tail
+                        latencies_ms.append(latency_ms)
+                        hits = res.value or []
+                        timeouts += res.reason == TIMEOUT
+                        hedged += res.hedged
+                        ranked = _ranked_labels(hits)
+
+                        evals.append(QueryEval(query_id=qid, truth=truth, ranked_labels=ranked))
+                        table.append(qid, truth, hits)
+                        progress.update(ranked, truth)
+
+                        row: dict[str, object] = {
+                            "query_id": qid,
+                            "question": question,
+                            "truth": ",".join(sorted(truth)),
+                        }
+                        if filters:
+                            row["filters"] = json.dumps(filters, ensure_ascii=False)
+
+                        for i in range(min(cfg.run.topn, len(hits))):
+                            row[f"rank_{i+1}_label"] = hits[i].label
+                            row[f"rank_{i+1}_score"] = round(hits[i].score, 6)
+
+                        for k in cfg.run.k_list:
+                            row[f"hit@{k}"] = any(x in truth for x in ranked[:k])
+                        row["latency_ms"] = round(latency_ms, 3)
+                        row["status"] = res.reason or "ok"
+                        row["hedged"] = res.hedged
+
+                        details_rows.append(row)
+
+                    progress.finish_pair("pair_done")
+                    rec = recall_table(evals, cfg.run.k_list)
+                    summary: dict[str, object] = {
+                        "index": idx.name,
+                        "model": model_name,
+                        "queries": len(evals),
+                    }
+                    for k in cfg.run.k_list:
+                        summary[f"recall@{k}"] = round(rec[k], 4)
+                    summary.update(latency_summary(latencies_ms))
+                    if io_stats is not None:
+                        summary.update(io_stats.as_row())
+                    summary["timeouts"] = timeouts
+                    summary["timeout_rate"] = round(timeouts / len(evals), 4) if evals else 0.0
+                    if guard.hedge_after_sec > 0:
+                        summary["hedged"] = hedged
+
+                    summary_rows.append(summary)
+
+                    sheet_key = f"{idx.name}_{model_name}"
+                    per_index_sheets[sheet_key] = details_rows
+
+                    if "npz" in cfg.run.report_formats:
+                        npz_path = rankings_path(out_dir, idx.name, model_name)
+                        write_rankings(npz_path, table)
+                        logger.info(f"Wrote: {npz_path}")
+
+                    logger.info(
+                        "Result: "
+                        + ", ".join([f"R@{k}={summary[f'recall@{k}']}" for k in cfg.run.k_list])
+                        + f", p50={summary.get('latency_p50_ms')}ms, p95={summary.get('latency_p95_ms')}ms"
+                        + f", p99={summary.get('latency_p99_ms')}ms"
+                        + f", timeouts={timeouts}"
+                        + (f", hedged={hedged}" if "hedged" in summary else "")
+                    )
+                    if io_stats is not None:
+                        logger.info(
+                            "I/O: " + ", ".join(f"{k}={v}" for k, v in io_stats.as_row().items())
+                        )
+
+                except Exception as e:
+                    msg = f"[RUN FAIL] index={idx.name}, model={model_name}: {e}"
+                    logger.exception(msg)
+                    failures.append(msg)
+                    progress.skip(len(queries) - len(evals))
+                    progress.finish_pair("pair_failed")
+                    if cfg.run.fail_fast:
+                        raise
+                    summary_rows.append(
+                        {"index": idx.name, "model": model_name, "queries": 0, "error": str(e)}
+                    )
+                    continue
+
+            close = getattr(backend, "close", None)
+            if callable(close):
+                close()
+    finally:
+        progress.close()  # also on fail_fast / interrupts: stops the heartbeat
+
     # ---- Build A vs B delta summary per index (if both exist) ----
     delta_rows: list[dict[str, object]] = []
     by_index: dict[str, dict[str, dict[str, object]]] = {}
@@ -219,42 +334,60 @@ def run_benchmark(config_path: str) -> None:
     delta_highlights_md += _bullets(worst, "Top regressions (A-B) by R@1")
 
     # ---- Write xlsx (Summary + Delta + detail sheets) ----
-    xlsx_path = os.path.join(out_dir, "summary.xlsx")
-    write_summary_xlsx(
-        xlsx_path,
-        summary_rows=summary_rows,
-        per_index_sheets=per_index_sheets,
-        extra_sheets={"Delta": delta_rows},
-    )
-    logger.info(f"Wrote: {xlsx_path}")
+    if "xlsx" in cfg.run.report_formats:
+        xlsx_path = os.path.join(out_dir, "summary.xlsx")
+        write_summary_xlsx(
+            xlsx_path,
+            summary_rows=summary_rows,
+            per_index_sheets=per_index_sheets,
+            extra_sheets={"Delta": delta_rows},
+        )
+        logger.info(f"Wrote: {xlsx_path}")
 
     # ---- Write report.md using template ----
-    template_path = os.path.join("templates", "report_template.md")
-    with open(template_path, encoding="utf-8") as f:
-        tpl = f.read()
-
-    summary_md = render_summary_table_md(summary_rows)
-    delta_md = render_summary_table_md(delta_rows) if delta_rows else "_No A/B pairs_"
-
-    failures_md = "_None_"
-    if failures:
-        failures_md = "\n".join([f"- {x}" for x in failures])
-
-    report = tpl.format(
-        project_name=cfg.project_name,
-        run_id=run_id,
-        started_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        config_path=config_path,
-        summary_table_md=summary_md,
-        delta_table_md=delta_md,
-        winner_summary_md=winner_summary_md,
-        delta_highlights_md=delta_highlights_md,
-        failures_md=failures_md,
-    )
-
-    report_path = os.path.join(out_dir, "report.md")
-    with open(report_path, "w", encoding="utf-8") as f:
-        f.write(report)
-    logger.info(f"Wrote: {report_path}")
+    if "md" in cfg.run.report_formats:
+        template_path = os.path.join("templates", "report_template.md")
+        with open(template_path, encoding="utf-8") as f:
+            tpl = f.read()
+
+        summary_md = render_summary_table_md(summary_rows)
+        delta_md = render_summary_table_md(delta_rows) if delta_rows else "_No A/B pairs_"
+
+        failures_md = "_None_"
+        if failures:
+            failures_md = "\n".join([f"- {x}" for x in failures])
+
+        report = tpl.format(
+            project_name=cfg.project_name,
+            run_id=run_id,
+            started_at=started_at.replace("T", " "),
+            config_path=config_path,
+            summary_table_md=summary_md,
+            delta_table_md=delta_md,
+            winner_summary_md=winner_summary_md,
+            delta_highlights_md=delta_highlights_md,
+            failures_md=failures_md,
+        )
+
+        report_path = os.path.join(out_dir, "report.md")
+        with open(report_path, "w", encoding="utf-8") as f:
+            f.write(report)
+        logger.info(f"Wrote: {report_path}")
+
+    # ---- Record into run history (for `obrbr compare`) ----
+    if cfg.run.history_db:
+        record_run(
+            cfg.run.history_db,
+            RunInfo(
+                run_id=run_id,
+                project=cfg.project_name,
+                started_at=started_at,
+                config_path=config_path,
+                fingerprint=config_fingerprint(cfg),
+                out_dir=out_dir,
+            ),
+            summary_rows,
+        )
+        logger.info(f"Recorded run in history: {cfg.run.history_db}")
 
     logger.info("All done. (이제 벤치마크가 도망갈 곳이 없습니다.)")
@@ -1,5 +1,66 @@
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
 from .backend_base import SearchBackend, SearchHit
-from .es_backend import ElasticsearchBackend
-from .mock_backend import MockBackend
 
-__all__ = ["SearchBackend", "SearchHit", "MockBackend", "ElasticsearchBackend"]
+if TYPE_CHECKING:
+    from ..config import IndexCfg
+    from .es_backend import ElasticsearchBackend
+    from .mock_backend import MockBackend
+
+# backend name -> "module:Class". Modules are imported only when a backend is built,
+# so a mock-only run never pulls in the HTTP stack.
+_REGISTRY: dict[str, str] = {
+    "mock": "obrbr.search.mock_backend:MockBackend",
+    "elasticsearch": "obrbr.search.es_backend:ElasticsearchBackend",
+}
+
+_LAZY_ATTRS = {
+    "MockBackend": "mock",
+    "ElasticsearchBackend": "elasticsearch",
+}
+
+
+def register_backend(name: str, target: str) -> None:
+    """Register a backend as 'package.module:ClassName' under a config name."""
+    _REGISTRY[name.lower()] = target
+
+
+def backend_names() -> list[str]:
+    return sorted(_REGISTRY)
+
+
+def get_backend_cls(name: str) -> type:
+    target = _REGISTRY.get(name.lower())
+    if target is None:
+        raise ValueError(f"Unknown backend: {name} (known: {', '.join(backend_names())})")
+    module_name, cls_name = target.split(":", 1)
+    return getattr(import_module(module_name), cls_name)
+
+
+def make_backend(idx: IndexCfg) -> SearchBackend:
+    try:
+        cls = get_backend_cls(idx.backend)
+    except ValueError as e:
+        raise ValueError(f"[{idx.name}] {e}") from None
+    return cls(idx)
+
+
+def __getattr__(name: str) -> Any:
+    if name in _LAZY_ATTRS:
+        return get_backend_cls(_LAZY_ATTRS[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = [
+    "SearchBackend",
+    "SearchHit",
+    "MockBackend",
+    "ElasticsearchBackend",
+    "backend_names",
+    "get_backend_cls",
+    "make_backend",
+    "register_backend",
+]
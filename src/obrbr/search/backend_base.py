@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import json
 from dataclasses import dataclass
 from typing import Protocol
 
@@ -11,5 +12,24 @@ class SearchHit:
     score: float
 
 
+# field -> allowed values (OR within a field, AND across fields)
+Filters = dict[str, list[str]]
+
+
+def filter_value(v: object) -> str:
+    """JSON scalar -> filter term, spelled the way ES accepts it (true/false/null, not True)."""
+    if isinstance(v, bool) or v is None:
+        return json.dumps(v)
+    return str(v)
+
+
 class SearchBackend(Protocol):
-    def search(self, query_vector: list[float], topn: int) -> list[SearchHit]: ...
+    # timeout: seconds left in the query deadline (None = no deadline); network backends
+    # cap their request timeout and retries with it, local ones may ignore it.
+    def search(
+        self,
+        query_vector: list[float],
+        topn: int,
+        filters: Filters | None = None,
+        timeout: float | None = None,
+    ) -> list[SearchHit]: ...
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass, field
+
+from .backend_base import filter_value
+
+
+@dataclass
+class StringDict:
+    """Dictionary-encoded string column: each distinct value stored once, rows hold int codes."""
+
+    values: list[str] = field(default_factory=list)
+    codes: array = field(default_factory=lambda: array("i"))
+    _index: dict[str, int] = field(default_factory=dict, repr=False)
+
+    def append(self, value: str) -> None:
+        code = self._index.get(value)
+        if code is None:
+            code = len(self.values)
+            self.values.append(value)
+            self._index[value] = code
+        self.codes.append(code)
+
+    def __getitem__(self, row: int) -> str:
+        return self.values[self.codes[row]]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+@dataclass
+class PackedStrings:
+    """High-cardinality string column (e.g. doc ids): one joined blob + offsets."""
+
+    blob: str = ""
+    offsets: array = field(default_factory=lambda: array("q", [0]))
+
+    @classmethod
+    def from_list(cls, values: list[str]) -> PackedStrings:
+        offsets = array("q", [0])
+        pos = 0
+        for v in values:
+            pos += len(v)
+            offsets.append(pos)
+        return cls(blob="".join(values), offsets=offsets)
+
+    def __getitem__(self, row: int) -> str:
+        return self.blob[self.offsets[row] : self.offsets[row + 1]]
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+@dataclass
+class DocStore:
+    """
+    Compact per-doc metadata for local backends: only id and label are kept.
+    Labels are dictionary-encoded (few distinct answers, many docs); ids are packed.
+    """
+
+    ids: PackedStrings
+    labels: StringDict
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def doc_id(self, row: int) -> str:
+        return self.ids[row]
+
+    def label(self, row: int) -> str:
+        return self.labels[row]
+
+
+class DocStoreBuilder:
+    def __init__(self) -> None:
+        self._ids: list[str] = []
+        self._labels = StringDict()
+
+    def add(self, doc_id: str, label: str) -> None:
+        self._ids.append(doc_id)
+        self._labels.append(label)
+
+    def build(self) -> DocStore:
+        store = DocStore(ids=PackedStrings.from_list(self._ids), labels=self._labels)
+        self._ids = []
+        return store
+
+
+# set-bit positions of every byte value, for bitmap -> row ids
+_BYTE_BITS: list[tuple[int, ...]] = [tuple(b for b in range(8) if v >> b & 1) for v in range(256)]
+
+
+def _as_values(v: object) -> list[str]:
+    if v is None:
+        return []
+    if isinstance(v, list | tuple | set):
+        return [filter_value(x) for x in v]
+    return [filter_value(v)]
+
+
+class FilterIndex:
+    """
+    Per-field value -> doc bitmap, built once at load time. Bitmaps are Python ints
+    (bit i = doc row i), so AND/OR across values and fields run in C.
+    Intended for low/medium-cardinality metadata (tenant, category, answer set).
+    """
+
+    def __init__(self, fields: list[str]) -> None:
+        self.fields = list(fields)
+        self.n_docs = 0
+        self._postings: dict[str, dict[str, array]] = {f: {} for f in self.fields}
+        self.bitmaps: dict[str, dict[str, int]] = {f: {} for f in self.fields}
+
+    def add(self, row: int, doc: dict[str, object]) -> None:
+        for f in self.fields:
+            for v in _as_values(doc.get(f)):
+                self._postings[f].setdefault(v, array("i")).append(row)
+        self.n_docs = max(self.n_docs, row + 1)
+
+    def build(self) -> None:
+        n_bytes = (self.n_docs + 7) // 8
+        for f, by_value in self._postings.items():
+            for v, rows in by_value.items():
+                buf = bytearray(n_bytes)
+                for r in rows:
+                    buf[r >> 3] |= 1 << (r & 7)
+                self.bitmaps[f][v] = int.from_bytes(buf, "little")
+        self._postings = {}
+
+    def allowed(self, filters: dict[str, list[str]]) -> int:
+        """AND across fields, OR across the values of one field."""
+        bm = (1 << self.n_docs) - 1
+        for f, values in filters.items():
+            by_value = self.bitmaps.get(f)
+            if by_value is None:
+                raise ValueError(f"filter field '{f}' is not indexed (filter_fields={self.fields})")
+            field_bm = 0
+            for v in values:
+                field_bm |= by_value.get(v, 0)
+            bm &= field_bm
+            if not bm:
+                break
+        return bm
+
+    def rows(self, bitmap: int) -> list[int]:
+        out: list[int] = []
+        data = bitmap.to_bytes((self.n_docs + 7) // 8, "little")
+        for i, byte in enumerate(data):
+            if byte:
+                base = i << 3
+                out.extend(base + b for b in _BYTE_BITS[byte])
+        return out
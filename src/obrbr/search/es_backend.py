@@ -1,78 +1,211 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass, field
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from ..config import IndexCfg
-from .backend_base import SearchHit
+from .backend_base import Filters, SearchHit
+
+# Status codes worth retrying: throttling + transient server/gateway errors.
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+@dataclass
+class EsIoStats:
+    """
+    Per-pair I/O counters. Each search counts into its own EsIoStats and merges it here when
+    it ends, under a lock; an attempt that outlives reset() (abandoned by the deadline or a
+    lost hedge finishing during the next pair) is dropped instead of counted there.
+    """
+
+    requests: int = 0
+    retries: int = 0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    epoch: int = field(default=0, repr=False, compare=False)  # bumped by reset()
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests = self.retries = self.bytes_sent = self.bytes_received = 0
+            self.epoch += 1
+
+    def merge(self, other: EsIoStats, epoch: int) -> None:
+        with self._lock:
+            if epoch != self.epoch:
+                return  # started before the last reset(): belongs to an earlier pair
+            self.requests += other.requests
+            self.retries += other.retries
+            self.bytes_sent += other.bytes_sent
+            self.bytes_received += other.bytes_received
+
+    def as_row(self) -> dict[str, object]:
+        return {
+            "es_requests": self.requests,
+            "es_retries": self.retries,
+            "es_bytes_sent": self.bytes_sent,
+            "es_bytes_received": self.bytes_received,
+        }
 
 
 @dataclass
 class ElasticsearchBackend:
     idx_cfg: IndexCfg
+    stats: EsIoStats = field(default_factory=EsIoStats)
+
+    def __post_init__(self) -> None:
+        if not self.idx_cfg.es_url or not self.idx_cfg.es_index:
+            raise ValueError(
+                f"[{self.idx_cfg.name}] es_url/es_index are required for elasticsearch backend"
+            )
+
+        self._url = self.idx_cfg.es_url.rstrip("/") + f"/{self.idx_cfg.es_index}/_search"
+
+        # One pooled keep-alive session per backend (instead of a new connection per query).
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(1, self.idx_cfg.es_pool_maxsize))
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+        self._session.headers.update({"Content-Type": "application/json"})
+        self._session.auth = self._auth()
+        self._session.verify = self.idx_cfg.es_verify_tls
 
     def _auth(self) -> tuple[str, str] | None:
         if self.idx_cfg.es_auth_user and self.idx_cfg.es_auth_pass:
             return (self.idx_cfg.es_auth_user, self.idx_cfg.es_auth_pass)
         return None
 
-    def search(self, query_vector: list[float], topn: int) -> list[SearchHit]:
-        """
-        Minimal ES search.
-        - If es_use_knn: uses knn query (ES 8+)
-        - else: uses script_score cosineSimilarity (requires dense_vector)
-        """
-        if not self.idx_cfg.es_url or not self.idx_cfg.es_index:
-            raise ValueError(
-                f"[{self.idx_cfg.name}] es_url/es_index are required for elasticsearch backend"
-            )
+    def close(self) -> None:
+        self._session.close()
+
+    def _filter_path(self) -> str:
+        # Only ship back what we actually read: id, score and the label.
+        src = "fields" if self.idx_cfg.es_label_docvalues else "_source"
+        return f"hits.hits._id,hits.hits._score,hits.hits.{src}"
 
-        url = self.idx_cfg.es_url.rstrip("/") + f"/{self.idx_cfg.es_index}/_search"
-        headers = {"Content-Type": "application/json"}
+    def _label_projection(self) -> dict[str, object]:
+        if self.idx_cfg.es_label_docvalues:
+            return {"_source": False, "docvalue_fields": [self.idx_cfg.label_field]}
+        return {"_source": [self.idx_cfg.label_field]}
 
+    @staticmethod
+    def _filter_clauses(filters: Filters | None) -> list[dict[str, object]]:
+        return [{"terms": {f: list(values)}} for f, values in (filters or {}).items()]
+
+    def _build_body(
+        self, query_vector: list[float], topn: int, filters: Filters | None = None
+    ) -> dict[str, object]:
+        clauses = self._filter_clauses(filters)
         if self.idx_cfg.es_use_knn:
-            body = {
-                "size": topn,
-                "knn": {
-                    "field": self.idx_cfg.vector_field,
-                    "query_vector": query_vector,
-                    "k": topn,
-                    "num_candidates": max(50, topn * 10),
-                },
-                "_source": [self.idx_cfg.label_field],
+            knn: dict[str, object] = {
+                "field": self.idx_cfg.vector_field,
+                "query_vector": query_vector,
+                "k": topn,
+                "num_candidates": max(50, topn * 10),
             }
+            if clauses:
+                knn["filter"] = clauses  # pre-filter inside the ANN search
+            body: dict[str, object] = {"size": topn, "knn": knn}
         else:
+            base_query = {"bool": {"filter": clauses}} if clauses else {"match_all": {}}
             body = {
                 "size": topn,
                 "query": {
                     "script_score": {
-                        "query": {"match_all": {}},
+                        "query": base_query,
                         "script": {
                             "source": f"cosineSimilarity(params.q, '{self.idx_cfg.vector_field}')",
                             "params": {"q": query_vector},
                         },
                     }
                 },
-                "_source": [self.idx_cfg.label_field],
             }
+        body.update(self._label_projection())
+        return body
+
+    def _backoff(self, attempt: int) -> float:
+        # Full jitter: sleep U(0, base * 2^attempt), capped.
+        cap = self.idx_cfg.es_backoff_max_sec
+        return random.uniform(0.0, min(cap, self.idx_cfg.es_backoff_base_sec * (2**attempt)))
+
+    def _post(self, payload: bytes, stats: EsIoStats, timeout: float | None = None) -> bytes:
+        deadline = time.monotonic() + timeout if timeout is not None else math.inf
+        attempt = 0
+        while True:
+            left = deadline - time.monotonic()
+            if left <= 0:
+                raise requests.Timeout(f"query deadline exceeded after {attempt} attempt(s)")
+            stats.requests += 1
+            stats.bytes_sent += len(payload)
+            try:
+                r = self._session.post(
+                    self._url,
+                    data=payload,
+                    params={"filter_path": self._filter_path()},
+                    timeout=min(self.idx_cfg.es_timeout_sec, left),
+                )
+            except requests.exceptions.SSLError:
+                raise  # TLS/cert failures never heal on retry
+            except requests.ConnectionError:
+                # includes ConnectTimeout; a ReadTimeout (server slow after accepting) is not
+                # retried, so one query blocks for at most ~es_timeout_sec on a stalled node
+                if attempt >= self.idx_cfg.es_max_retries:
+                    raise
+            else:
+                stats.bytes_received += len(r.content)
+                if r.status_code not in _RETRY_STATUS or attempt >= self.idx_cfg.es_max_retries:
+                    r.raise_for_status()
+                    return r.content
+
+            delay = self._backoff(attempt)
+            if time.monotonic() + delay >= deadline:
+                raise requests.Timeout(f"query deadline exceeded after {attempt + 1} attempt(s)")
+            stats.retries += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def _parse_label(self, h: dict) -> str:
+        if self.idx_cfg.es_label_docvalues:
+            vals = (h.get("fields") or {}).get(self.idx_cfg.label_field)
+            return str(vals[0]) if vals else ""
+        src = h.get("_source") or {}
+        return str(src.get(self.idx_cfg.label_field, ""))
+
+    def search(
+        self,
+        query_vector: list[float],
+        topn: int,
+        filters: Filters | None = None,
+        timeout: float | None = None,
+    ) -> list[SearchHit]:
+        """
+        Minimal ES search.
+        - If es_use_knn: uses knn query (ES 8+)
+        - else: uses script_score cosineSimilarity (requires dense_vector)
+        - Label is read from docvalue_fields (default) or _source; response trimmed via filter_path
+        - filters become `terms` clauses (knn.filter / bool.filter)
+        - timeout (query deadline) caps each request and stops retrying once it has passed
+        """
+        body = self._build_body(query_vector, topn, filters)
+        payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
 
-        r = requests.post(
-            url,
-            json=body,
-            headers=headers,
-            auth=self._auth(),
-            verify=self.idx_cfg.es_verify_tls,
-            timeout=30,
-        )
-        r.raise_for_status()
-        data = r.json()
+        epoch, stats = self.stats.epoch, EsIoStats()
+        try:
+            content = self._post(payload, stats, timeout)
+        finally:
+            self.stats.merge(stats, epoch)
+        data = json.loads(content or b"{}")
         hits = data.get("hits", {}).get("hits", [])
         out: list[SearchHit] = []
         for h in hits:
             doc_id = str(h.get("_id", ""))
-            score = float(h.get("_score", 0.0))
-            src = h.get("_source", {}) or {}
-            label = str(src.get(self.idx_cfg.label_field, ""))
-            out.append(SearchHit(doc_id=doc_id, label=label, score=score))
+            score = float(h.get("_score") or 0.0)
+            out.append(SearchHit(doc_id=doc_id, label=self._parse_label(h), score=score))
         return out
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import heapq
 import json
+import time
+from array import array
 from dataclasses import dataclass
 
 from ..config import IndexCfg
 from ..embedder import Embedder
-from .backend_base import SearchHit
+from .backend_base import Filters, SearchHit
+from .doc_store import DocStore, DocStoreBuilder, FilterIndex
+
+_CHUNK = 2048  # docs scored between deadline checks
 
 
 def _dot(a: list[float], b: list[float]) -> float:
@@ -20,9 +26,6 @@ class MockBackend:
         if not self.idx_cfg.docs_path:
             raise ValueError(f"[{self.idx_cfg.name}] docs_path is required for mock backend")
 
-        with open(self.idx_cfg.docs_path, encoding="utf-8") as f:
-            self.docs = [json.loads(line) for line in f if line.strip()]
-
         # Build document vectors in-memory (acts like "stored vector field")
         dv = self.idx_cfg.doc_vector
         if dv is None:
@@ -31,23 +34,64 @@ class MockBackend:
             dv = EmbeddingCfg(provider="local_hash", dim=32, salt="A")
 
         doc_embedder = Embedder(dv)
-        self.doc_vectors: list[list[float]] = []
-        for d in self.docs:
-            text = str(d.get(self.idx_cfg.doc_text_field, ""))
-            vec = doc_embedder.embed(text)
-            d[self.idx_cfg.vector_field] = vec
-            self.doc_vectors.append(vec)
-
-    def search(self, query_vector: list[float], topn: int) -> list[SearchHit]:
-        scored: list[SearchHit] = []
-        for d, v in zip(self.docs, self.doc_vectors, strict=False):
-            score = _dot(query_vector, v)  # cosine since both normalized
-            scored.append(
+        builder = DocStoreBuilder()
+        self.filter_index = FilterIndex(self.idx_cfg.filter_fields)
+        self.doc_vectors: list[array] = []
+
+        # Stream docs: keep only id/label (compact store) + vector; the parsed dict is dropped.
+        with open(self.idx_cfg.docs_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                d = json.loads(line)
+                self.filter_index.add(len(self.doc_vectors), d)
+                builder.add(
+                    str(d.get(self.idx_cfg.id_field, "")),
+                    str(d.get(self.idx_cfg.label_field, "")),
+                )
+                text = str(d.get(self.idx_cfg.doc_text_field, ""))
+                self.doc_vectors.append(array("d", doc_embedder.embed(text)))
+
+        self.store: DocStore = builder.build()
+        self.filter_index.build()
+
+    def _score(
+        self, query_vector: list[float], rows: list[int] | None, deadline: float
+    ) -> list[float]:
+        """Cosine (normalized) per row, in chunks; raises TimeoutError past the deadline."""
+        vectors = self.doc_vectors
+        n = len(vectors) if rows is None else len(rows)
+        scores: list[float] = []
+        for lo in range(0, n, _CHUNK):
+            if time.monotonic() >= deadline:
+                # stop burning CPU (and the GIL) for a query the caller already gave up on
+                raise TimeoutError(f"[{self.idx_cfg.name}] search deadline exceeded")
+            hi = min(lo + _CHUNK, n)
+            if rows is None:
+                scores.extend(_dot(query_vector, vectors[r]) for r in range(lo, hi))
+            else:
+                scores.extend(_dot(query_vector, vectors[r]) for r in rows[lo:hi])
+        return scores
+
+    def search(
+        self,
+        query_vector: list[float],
+        topn: int,
+        filters: Filters | None = None,
+        timeout: float | None = None,
+    ) -> list[SearchHit]:
+        deadline = time.monotonic() + timeout if timeout is not None else float("inf")
+        # pre-filter: score only the rows allowed by the bitmap index
+        rows = self.filter_index.rows(self.filter_index.allowed(filters)) if filters else None
+        scores = self._score(query_vector, rows, deadline)
+        # nlargest == sorted(reverse=True)[:topn], ties keep doc order; hits built for top-n only
+        top = heapq.nlargest(topn, range(len(scores)), key=scores.__getitem__)
+        out: list[SearchHit] = []
+        for i in top:
+            row = rows[i] if rows is not None else i
+            out.append(
                 SearchHit(
-                    doc_id=str(d.get(self.idx_cfg.id_field, "")),
-                    label=str(d.get(self.idx_cfg.label_field, "")),
-                    score=float(score),
+                    doc_id=self.store.doc_id(row), label=self.store.label(row), score=scores[i]
                 )
             )
-        scored.sort(key=lambda x: x.score, reverse=True)
-        return scored[:topn]
+        return out
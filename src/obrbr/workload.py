@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+# Synthetic corpus/query generator in the existing schema:
+#   docs.jsonl     {"doc_id", "answer_id", "question"}
+#   queries.jsonl  {"query_id", "question", "answer_ids"}
+#
+# Every record is a pure function of (seed, row), so duplicates and queries can refer back
+# to any earlier doc by regenerating it instead of keeping the corpus in memory. Output is
+# streamed line by line: memory use is constant in the number of docs/queries.
+
+_SYLLABLES = [
+    "ka", "ri", "mo", "su", "te", "na", "lo", "pi", "ze", "du",
+    "han", "gil", "son", "bae", "yun", "seo", "jin", "min", "woo", "rak",
+]  # fmt: skip
+_VOCAB_SIZE = 4000
+_DOC_WORDS = (6, 14)
+_QUERY_MARKER = 0x5EED_0F_0E  # separates the query rng stream from the doc stream
+
+
+@dataclass
+class WorkloadSpec:
+    docs: int
+    queries: int
+    labels: int
+    dup_ratio: float = 0.0  # exact duplicate text of an earlier doc (same label)
+    near_dup_ratio: float = 0.0  # lightly perturbed copy of an earlier doc (same label)
+    truth_min: int = 1
+    truth_max: int = 1
+    seed: int = 42
+
+    def validate(self) -> None:
+        if self.docs <= 0 or self.queries < 0 or self.labels <= 0:
+            raise ValueError("docs and labels must be > 0, queries must be >= 0")
+        if self.dup_ratio < 0 or self.near_dup_ratio < 0:
+            raise ValueError("dup_ratio/near_dup_ratio must be >= 0")
+        if self.dup_ratio + self.near_dup_ratio > 1.0:
+            raise ValueError("dup_ratio + near_dup_ratio must be <= 1")
+        if not (1 <= self.truth_min <= self.truth_max <= self.labels):
+            raise ValueError("need 1 <= truth_min <= truth_max <= labels")
+
+
+def _word(i: int) -> str:
+    n = len(_SYLLABLES)
+    return _SYLLABLES[i % n] + _SYLLABLES[(i // n) % n] + _SYLLABLES[(i // (n * n)) % n]
+
+
+class WorkloadGenerator:
+    def __init__(self, spec: WorkloadSpec) -> None:
+        spec.validate()
+        self.spec = spec
+        self._id_width = len(str(spec.docs - 1))
+        self._label_width = len(str(spec.labels - 1))
+
+    def _rng(self, row: int, stream: int = 0) -> random.Random:
+        return random.Random((self.spec.seed * 1_000_003 + stream) * 10_000_019 + row)
+
+    def label(self, label_no: int) -> str:
+        return f"ans_{label_no:0{self._label_width}d}"
+
+    def _base(self, row: int) -> tuple[str, str]:
+        """Original (text, label) of doc row, before duplicate/near-duplicate substitution."""
+        rng = self._rng(row)
+        label_no = rng.randrange(self.spec.labels)
+        # a few label-specific topic words + generic words
+        topic = [_word((label_no * 7 + t) % _VOCAB_SIZE) for t in range(3)]
+        words = topic + [
+            _word(rng.randrange(_VOCAB_SIZE)) for _ in range(rng.randint(*_DOC_WORDS) - 3)
+        ]
+        rng.shuffle(words)
+        return " ".join(words), self.label(label_no)
+
+    @staticmethod
+    def _perturb(text: str, rng: random.Random) -> str:
+        words = text.split()
+        op = rng.randrange(3)
+        if op == 0 and len(words) > 1:
+            words.pop(rng.randrange(len(words)))
+        elif op == 1 and len(words) > 1:
+            i = rng.randrange(len(words) - 1)
+            words[i], words[i + 1] = words[i + 1], words[i]
+        else:
+            words.insert(rng.randrange(len(words) + 1), _word(rng.randrange(_VOCAB_SIZE)))
+        return " ".join(words)
+
+    def _kind(self, row: int, rng: random.Random) -> str:
+        """'dup', 'near_dup' or '' (base row); consumes the first draw of the row's stream."""
+        r = rng.random()
+        if row == 0:
+            return ""
+        if r < self.spec.dup_ratio:
+            return "dup"
+        if r < self.spec.dup_ratio + self.spec.near_dup_ratio:
+            return "near_dup"
+        return ""
+
+    def _resolve(self, row: int) -> int:
+        """Follow copy links back to a base row (source rows are strictly earlier, so it ends)."""
+        while True:
+            rng = self._rng(row, stream=1)
+            if not self._kind(row, rng):
+                return row
+            row = rng.randrange(row)
+
+    def doc(self, row: int) -> dict[str, str]:
+        rng = self._rng(row, stream=1)
+        kind = self._kind(row, rng)
+        if kind:
+            # copy a base row's text, so an exact dup always matches an emitted doc
+            text, label = self._base(self._resolve(rng.randrange(row)))
+            if kind == "near_dup":
+                text = self._perturb(text, rng)
+        else:
+            text, label = self._base(row)
+        return {"doc_id": f"d{row:0{self._id_width}d}", "answer_id": label, "question": text}
+
+    def query(self, row: int) -> dict[str, object]:
+        rng = self._rng(row, stream=_QUERY_MARKER)
+        src = self.doc(rng.randrange(self.spec.docs))
+        truth = [src["answer_id"]]
+        size = rng.randint(self.spec.truth_min, self.spec.truth_max)
+        while len(truth) < size:
+            extra = self.label(rng.randrange(self.spec.labels))
+            if extra not in truth:
+                truth.append(extra)
+        return {
+            "query_id": f"q{row}",
+            "question": self._perturb(src["question"], rng),
+            "answer_ids": truth,
+        }
+
+
+def _write_jsonl(path: str, records: Iterable[dict[str, object]]) -> int:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    n = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for rec in records:
+            f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            n += 1
+    return n
+
+
+def generate_workload(spec: WorkloadSpec, out_dir: str) -> tuple[str, str]:
+    """Write docs.jsonl and queries.jsonl under out_dir. Returns (docs_path, queries_path)."""
+    gen = WorkloadGenerator(spec)
+    docs_path = os.path.join(out_dir, "docs.jsonl")
+    queries_path = os.path.join(out_dir, "queries.jsonl")
+    _write_jsonl(docs_path, (gen.doc(i) for i in range(spec.docs)))
+    _write_jsonl(queries_path, (gen.query(i) for i in range(spec.queries)))
+    return docs_path, queries_path
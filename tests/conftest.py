@@ -0,0 +1,40 @@
+import json
+import os
+
+import pytest
+
+import obrbr.runner as runner
+
+
+@pytest.fixture
+def make_bench_cfg(tmp_path, monkeypatch):
+    """
+    Write a minimal bench.yaml over the sample queries and route every index to `backend`.
+    Results go to tmp_path/"out", run history to tmp_path/"h.sqlite". Returns the config path.
+    """
+
+    def make(backend, models=("A",), index="es", **run_overrides) -> str:
+        run = {
+            "output_root": str(tmp_path / "out"),
+            "k_list": [1],
+            "topn": 1,
+            "report_formats": [],
+            "history_db": str(tmp_path / "h.sqlite"),
+            "progress_interval_sec": 0,
+            **run_overrides,
+        }
+        cfg = {
+            "project": {"name": "t"},
+            "run": run,
+            "data": {"queries_path": os.path.abspath("data/queries.sample.jsonl")},
+            "models": {
+                m: {"query_embedding": {"provider": "local_hash", "dim": 8}} for m in models
+            },
+            "indices": [{"name": index, "backend": "elasticsearch", "vector_field": "v"}],
+        }
+        path = tmp_path / "bench.yaml"
+        path.write_text(json.dumps(cfg), encoding="utf-8")  # JSON is valid YAML
+        monkeypatch.setattr(runner, "make_backend", lambda idx: backend)
+        return str(path)
+
+    return make
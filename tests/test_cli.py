@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+from obrbr.__main__ import main
+from obrbr.search import backend_names, get_backend_cls
+
+CONFIG = os.path.join("configs", "bench.yaml")
+
+
+def test_validate_ok(capsys):
+    assert main(["validate", "--config", CONFIG]) == 0
+    assert "[OK]" in capsys.readouterr().out
+
+
+def test_validate_reports_problems(tmp_path, capsys):
+    cfg = tmp_path / "bench.yaml"
+    cfg.write_text(
+        "project: {name: t}\n"
+        "run: {output_root: out, k_list: [1, 20], topn: 10, report_formats: [xlsx, pdf]}\n"
+        "data: {queries_path: missing.jsonl}\n"
+        "models: {A: {query_embedding: {provider: local_hash, dim: 8}}}\n"
+        "indices:\n"
+        "  - {name: i1, backend: faiss, vector_field: v}\n",
+        encoding="utf-8",
+    )
+    assert main(["validate", "-c", str(cfg)]) == 1
+    err = capsys.readouterr().err
+    assert "topn" in err
+    assert "pdf" in err
+    assert "missing.jsonl" in err
+    assert "faiss" in err
+
+
+def test_validate_does_not_import_heavy_modules():
+    code = (
+        "import sys\n"
+        "from obrbr.__main__ import main\n"
+        f"main(['validate', '-c', {CONFIG!r}])\n"
+        "heavy = [m for m in ('requests', 'openpyxl', 'obrbr.runner') if m in sys.modules]\n"
+        "assert not heavy, heavy\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True, capture_output=True)
+
+
+def test_backend_registry():
+    assert {"mock", "elasticsearch"} <= set(backend_names())
+    assert get_backend_cls("MOCK").__name__ == "MockBackend"
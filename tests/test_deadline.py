@@ -0,0 +1,123 @@
+import glob
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+import obrbr.runner as runner
+from obrbr.deadline import QueryGuard
+from obrbr.rankings import load_run_rankings
+from obrbr.search.backend_base import SearchHit
+
+
+def test_guard_inline_when_disabled():
+    g = QueryGuard()
+    res = g.run(lambda left: (left, threading.current_thread().name))
+    assert res.value == (None, threading.current_thread().name)
+    assert (res.reason, res.hedged) == ("", False)
+
+
+def test_guard_times_out_instead_of_raising():
+    g = QueryGuard(timeout_sec=0.05)
+    res = g.run(lambda left: time.sleep(0.5))
+    assert (res.value, res.reason) == (None, "timeout")
+
+
+def test_guard_hedge_wins_over_slow_first_attempt():
+    calls = []
+
+    def fn(left):
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.5)  # slow outlier
+            return "slow"
+        return "fast"
+
+    g = QueryGuard(timeout_sec=0.4, hedge_after_sec=0.02)
+    res = g.run(fn)
+    assert (res.value, res.reason, res.hedged) == ("fast", "", True)
+
+
+def test_guard_propagates_errors():
+    def boom(left):
+        raise RuntimeError("boom")
+
+    g = QueryGuard(timeout_sec=1.0)
+    with pytest.raises(RuntimeError):
+        g.run(boom)
+
+
+def test_abandoned_attempts_do_not_starve_later_queries():
+    g = QueryGuard(timeout_sec=0.1)
+    budgets = []
+
+    def stuck(left):
+        budgets.append(left)
+        time.sleep(1.0)  # keeps running long after the guard gave up on it
+
+    for _ in range(6):  # each timeout leaves its attempt sleeping in the background
+        assert g.run(stuck).reason == "timeout"
+
+    for _ in range(3):  # later fast calls still finish within their own deadline
+        res = g.run(lambda left: "ok")
+        assert (res.value, res.reason) == ("ok", "")
+    assert all(0.0 < b <= 0.1 for b in budgets)  # each call is told its remaining budget
+
+
+class _SometimesSlowBackend:
+    def __init__(self) -> None:
+        self.n = 0
+
+    def search(self, query_vector, topn, filters=None, timeout=None):
+        self.n += 1
+        if self.n % 4 == 0:
+            time.sleep(0.3)
+        return [SearchHit(doc_id="d1", label="a_reset_pw", score=1.0)]
+
+
+def test_runner_records_timeouts_as_misses(tmp_path, make_bench_cfg):
+    out_root = tmp_path / "out"
+    cfg = make_bench_cfg(
+        _SometimesSlowBackend(), index="slow", report_formats=["npz"], query_timeout_sec=0.1
+    )
+
+    runner.run_benchmark(cfg)
+
+    (progress,) = glob.glob(str(out_root / "*" / "progress.jsonl"))
+    with open(progress, encoding="utf-8") as f:
+        last = [json.loads(x) for x in f][-1]
+    assert last["event"] == "pair_done"  # pair finished despite timeouts
+    assert last["done"] == last["total"] == 8
+    assert last["recall@1"] == 0.125  # only q1 has truth a_reset_pw
+
+    # every 4th call timed out and was stored as an empty ranking (miss), not a pair failure
+    (run_dir,) = glob.glob(str(out_root / "*"))
+    table = load_run_rankings(run_dir)[("slow", "A")]
+    assert [r for r in range(len(table)) if not table.ranked_labels(r)] == [3, 7]
+
+
+class _FlakyTimeoutBackend:
+    def __init__(self) -> None:
+        self.n = 0
+
+    def search(self, query_vector, topn, filters=None, timeout=None):
+        self.n += 1
+        if self.n == 2:
+            raise requests.ReadTimeout("read timed out")
+        if self.n == 5:
+            raise TimeoutError("socket timeout")
+        return [SearchHit(doc_id="d1", label="a_reset_pw", score=1.0)]
+
+
+def test_runner_counts_io_timeouts_without_query_deadline(tmp_path, make_bench_cfg):
+    from obrbr.history import list_runs, load_run_metrics
+
+    db = tmp_path / "h.sqlite"
+    runner.run_benchmark(make_bench_cfg(_FlakyTimeoutBackend()))
+
+    (run,) = list_runs(str(db))
+    metrics = load_run_metrics(str(db), run.run_id)[("es", "A")]
+    assert "recall@1" in metrics  # pair completed instead of failing
+    assert (metrics["timeouts"], metrics["timeout_rate"]) == (2, 0.25)
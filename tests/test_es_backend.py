@@ -0,0 +1,189 @@
+import json
+import threading
+import time
+
+import pytest
+import requests
+
+from obrbr.config import IndexCfg
+from obrbr.search.es_backend import ElasticsearchBackend, EsIoStats
+
+
+class _Resp:
+    def __init__(self, status_code: int, payload: dict) -> None:
+        self.status_code = status_code
+        self.content = json.dumps(payload).encode("utf-8")
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class _FakeSession:
+    def __init__(self, responses: list[_Resp]) -> None:
+        self.responses = responses
+        self.calls: list[dict] = []
+
+    def post(self, url, data, params, timeout):
+        self.calls.append({"url": url, "body": json.loads(data), "params": params})
+        return self.responses.pop(0)
+
+
+def _backend(**kw) -> ElasticsearchBackend:
+    idx = IndexCfg(
+        name="es",
+        backend="elasticsearch",
+        vector_field="question_vt",
+        es_url="http://localhost:9200/",
+        es_index="qa",
+        es_backoff_base_sec=0.0,
+        **kw,
+    )
+    return ElasticsearchBackend(idx)
+
+
+def test_es_search_trims_response_and_reads_docvalues():
+    b = _backend()
+    hit = {"_id": "d1", "_score": 0.9, "fields": {"answer_id": ["a1"]}}
+    b._session = _FakeSession([_Resp(200, {"hits": {"hits": [hit]}})])
+
+    hits = b.search([0.1, 0.2], topn=3)
+
+    call = b._session.calls[0]
+    assert call["url"] == "http://localhost:9200/qa/_search"
+    assert call["body"]["_source"] is False
+    assert call["body"]["docvalue_fields"] == ["answer_id"]
+    assert "hits.hits._id" in call["params"]["filter_path"]
+    assert [(h.doc_id, h.label, h.score) for h in hits] == [("d1", "a1", 0.9)]
+    assert b.stats.requests == 1
+    assert b.stats.bytes_sent > 0 and b.stats.bytes_received > 0
+
+
+def test_es_search_retries_on_429_then_gives_up():
+    b = _backend(es_max_retries=1)
+    b._session = _FakeSession([_Resp(429, {}), _Resp(503, {})])
+
+    with pytest.raises(RuntimeError):
+        b.search([0.1], topn=1)
+    assert b.stats.requests == 2
+    assert b.stats.retries == 1
+
+
+def test_es_search_empty_result_with_filter_path():
+    b = _backend()
+    b._session = _FakeSession([_Resp(502, {}), _Resp(200, {})])
+    assert b.search([0.1], topn=1) == []
+    assert b.stats.retries == 1
+
+
+def test_es_filters_passed_to_knn_and_script_score():
+    filters = {"tenant": ["t1"], "category": ["a", "b"]}
+    clauses = [{"terms": {"tenant": ["t1"]}}, {"terms": {"category": ["a", "b"]}}]
+
+    b = _backend()
+    b._session = _FakeSession([_Resp(200, {})])
+    b.search([0.1], topn=1, filters=filters)
+    assert b._session.calls[0]["body"]["knn"]["filter"] == clauses
+
+    b = _backend(es_use_knn=False)
+    b._session = _FakeSession([_Resp(200, {})])
+    b.search([0.1], topn=1, filters=filters)
+    query = b._session.calls[0]["body"]["query"]["script_score"]["query"]
+    assert query == {"bool": {"filter": clauses}}
+
+    assert "filter" not in _backend()._build_body([0.1], 1)["knn"]
+
+
+class _RaisingSession:
+    def __init__(self, exc: Exception) -> None:
+        self.exc = exc
+        self.calls = 0
+
+    def post(self, url, data, params, timeout):
+        self.calls += 1
+        raise self.exc
+
+
+def test_es_does_not_retry_ssl_errors_or_read_timeouts():
+    for exc in (requests.exceptions.SSLError("bad cert"), requests.ReadTimeout("slow")):
+        b = _backend(es_max_retries=3)
+        b._session = _RaisingSession(exc)
+        with pytest.raises(type(exc)):
+            b.search([0.1], topn=1)
+        assert b._session.calls == 1
+
+    b = _backend(es_max_retries=2)
+    b._session = _RaisingSession(requests.ConnectTimeout("no route"))
+    with pytest.raises(requests.ConnectTimeout):
+        b.search([0.1], topn=1)
+    assert b._session.calls == 3
+
+
+class _SlowSession:
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.timeouts: list[float] = []
+
+    def post(self, url, data, params, timeout):
+        self.timeouts.append(timeout)
+        time.sleep(self.delay)
+        return _Resp(503, {})
+
+
+def test_es_deadline_caps_request_timeout_and_stops_retries():
+    b = _backend(es_max_retries=10, es_timeout_sec=30.0)
+    b._session = _SlowSession(delay=0.03)
+    with pytest.raises(requests.Timeout):
+        b.search([0.1], topn=1, timeout=0.1)
+    assert b._session.timeouts[0] <= 0.1
+    assert len(b._session.timeouts) < 10  # gave up at the deadline, not after all retries
+
+
+class _GatedSession:
+    def __init__(self) -> None:
+        self.entered, self.release = threading.Event(), threading.Event()
+
+    def post(self, url, data, params, timeout):
+        self.entered.set()
+        self.release.wait(5)
+        return _Resp(200, {})
+
+
+def test_es_stats_of_attempt_outliving_reset_are_dropped():
+    b = _backend()
+    b._session = _GatedSession()
+    t = threading.Thread(target=b.search, args=([0.1], 1))
+    t.start()
+    b._session.entered.wait(5)
+    b.stats.reset()  # runner moved on to the next pair while the attempt is in flight
+    b._session.release.set()
+    t.join(5)
+    assert (b.stats.requests, b.stats.bytes_received) == (0, 0)
+
+    b.search([0.1], topn=1)  # attempts started after the reset count normally
+    assert b.stats.requests == 1
+
+
+class _CountingBackend:
+    def __init__(self) -> None:
+        self.stats = EsIoStats()
+
+    def search(self, query_vector, topn, filters=None, timeout=None):
+        self.stats.requests += 1
+        self.stats.bytes_sent += 10
+        return []
+
+
+def test_runner_records_es_io_stats_per_pair(tmp_path, make_bench_cfg):
+    import obrbr.runner as runner
+    from obrbr.history import list_runs, load_run_metrics
+
+    db = tmp_path / "h.sqlite"
+    runner.run_benchmark(make_bench_cfg(_CountingBackend(), models=("A", "B")))
+
+    (run,) = list_runs(str(db))
+    metrics = load_run_metrics(str(db), run.run_id)
+    # 8 sample queries per model, counters reset between models
+    assert metrics[("es", "A")]["es_requests"] == 8
+    assert metrics[("es", "B")]["es_requests"] == 8
+    assert metrics[("es", "B")]["es_bytes_sent"] == 80
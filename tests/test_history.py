@@ -0,0 +1,117 @@
+from obrbr.history import RunInfo, compare_runs, list_runs, record_run
+
+
+def _info(run_id: str, started_at: str) -> RunInfo:
+    return RunInfo(
+        run_id=run_id,
+        project="p",
+        started_at=started_at,
+        config_path="bench.yaml",
+        fingerprint="f",
+        out_dir=f"results/{run_id}",
+    )
+
+
+def test_record_and_compare_runs(tmp_path):
+    db = str(tmp_path / "history.sqlite")
+    record_run(
+        db,
+        _info("r1", "2026-10-01T09:00:00"),
+        [{"index": "i", "model": "A", "queries": 10, "recall@1": 0.8, "latency_p95_ms": 10.0}],
+    )
+    record_run(
+        db,
+        _info("r2", "2026-10-02T09:00:00"),
+        [
+            {"index": "i", "model": "A", "queries": 10, "recall@1": 0.7, "latency_p95_ms": 10.5},
+            {"index": "i", "model": "B", "queries": 0, "error": "boom"},
+        ],
+    )
+
+    assert [r.run_id for r in list_runs(db)] == ["r1", "r2"]
+    assert [r.run_id for r in list_runs(db, since="2026-10-02")] == ["r2"]
+    assert [r.run_id for r in list_runs(db, until="2026-10-01")] == ["r1"]
+
+    rows = {r["metric"]: r for r in compare_runs(db, "r1", "r2", latency_rise=0.10)}
+    assert rows["recall@1"]["delta"] == -0.1
+    assert rows["recall@1"]["regression"] is True
+    assert rows["latency_p95_ms"]["regression"] is False  # +5% < 10%
+
+
+def test_compare_flags_pairs_that_failed_or_vanished(tmp_path):
+    db = str(tmp_path / "history.sqlite")
+    ok = {"queries": 10, "recall@1": 0.9}
+    record_run(
+        db,
+        _info("r1", "2026-10-01T09:00:00"),
+        [{"index": "i", "model": m, **ok} for m in ("A", "B", "C")],
+    )
+    record_run(
+        db,
+        _info("r2", "2026-10-02T09:00:00"),
+        [
+            {"index": "i", "model": "A", "queries": 0, "error": "boom"},
+            {"index": "i", "model": "C", **ok},
+        ],
+    )
+
+    regressions = [r for r in compare_runs(db, "r1", "r2") if r["regression"]]
+    assert [(r["model"], r["metric"], r["new"]) for r in regressions] == [
+        ("A", "status", "error: boom"),
+        ("B", "status", "missing"),
+    ]
+
+    # the other direction (failed -> ok) is a fix, not a regression
+    assert not any(r["regression"] for r in compare_runs(db, "r2", "r1"))
+
+
+def test_compare_thresholds_per_metric_family(tmp_path):
+    db = str(tmp_path / "history.sqlite")
+    base = {"index": "i", "model": "A", "queries": 10, "latency_max_ms": 10.0}
+    base.update({"latency_p99_ms": 10.0, "timeout_rate": 0.0})
+    new = {**base, "latency_max_ms": 50.0, "latency_p99_ms": 10.5, "timeout_rate": 0.05}
+    record_run(db, _info("r1", "2026-10-01T09:00:00"), [base])
+    record_run(db, _info("r2", "2026-10-02T09:00:00"), [new])
+
+    rows = {r["metric"]: r for r in compare_runs(db, "r1", "r2", timeout_rise=0.10)}
+    assert rows["latency_max_ms"]["regression"] is False  # max is never gated
+    assert rows["latency_p99_ms"]["regression"] is False
+    assert rows["timeout_rate"]["regression"] is False  # +0.05 < 0.10
+
+    rows = {r["metric"]: r for r in compare_runs(db, "r1", "r2", timeout_rise=0.01)}
+    assert rows["timeout_rate"]["regression"] is True
+
+
+def test_record_run_replaces_same_run_id(tmp_path):
+    db = str(tmp_path / "history.sqlite")
+    row = {"index": "i", "model": "A", "queries": 1, "recall@1": 1.0}
+    record_run(db, _info("r1", "2026-10-01T09:00:00"), [row])
+    record_run(db, _info("r1", "2026-10-01T09:00:30"), [row])
+    assert len(list_runs(db)) == 1
+
+
+class _EmptyBackend:
+    def search(self, query_vector, topn, filters=None, timeout=None):
+        return []
+
+
+def test_same_minute_runs_are_both_kept(tmp_path, monkeypatch, make_bench_cfg):
+    from datetime import datetime
+
+    import obrbr.runner as runner
+
+    class _FrozenClock(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2026, 10, 19, 9, 0, 0)
+
+    db = tmp_path / "h.sqlite"
+    cfg = make_bench_cfg(_EmptyBackend())
+    monkeypatch.setattr(runner, "datetime", _FrozenClock)
+    runner.run_benchmark(cfg)
+    runner.run_benchmark(cfg)
+
+    runs = list_runs(str(db))
+    assert len(runs) == 2
+    assert runs[0].run_id != runs[1].run_id
+    assert runs[0].out_dir != runs[1].out_dir
@@ -1,4 +1,4 @@
-from obrbr.metrics import QueryEval, recall_at_k, recall_table
+from obrbr.metrics import QueryEval, latency_summary, recall_at_k, recall_table
 
 
 def test_recall_at_k_single_hit():
@@ -16,3 +16,12 @@ def test_recall_table():
     assert table[1] == 0.0
     assert table[2] == 1.0
     assert table[10] == 1.0
+
+
+def test_latency_summary_percentiles():
+    lat = [float(x) for x in range(1, 101)]  # 1..100 ms
+    s = latency_summary(lat)
+    assert s["latency_p50_ms"] == 50.0
+    assert s["latency_p95_ms"] == 95.0
+    assert s["latency_p99_ms"] == 99.0
+    assert latency_summary([]) == {}
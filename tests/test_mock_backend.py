@@ -1,6 +1,9 @@
 import json
 import os
 import tempfile
+from types import SimpleNamespace
+
+import pytest
 
 from obrbr.config import EmbeddingCfg, IndexCfg
 from obrbr.search.mock_backend import MockBackend
@@ -30,3 +33,112 @@ def test_mock_backend_search_runs():
         # If qvec is zero, dot-product will be 0 for all; still should not crash.
         hits = backend.search(qvec, topn=2)
         assert len(hits) == 2
+
+
+def test_mock_backend_compact_store_keeps_id_and_label():
+    with tempfile.TemporaryDirectory() as td:
+        docs_path = os.path.join(td, "docs.jsonl")
+        docs = [
+            {"doc_id": "d1", "answer_id": "a1", "question": "q one", "extra": "x" * 100},
+            {"doc_id": "d22", "answer_id": "a1", "question": "q two"},
+            {"doc_id": "d333", "answer_id": "a2", "question": "q three"},
+        ]
+        with open(docs_path, "w", encoding="utf-8") as f:
+            for d in docs:
+                f.write(json.dumps(d, ensure_ascii=False) + "\n")
+
+        idx = IndexCfg(name="test", backend="mock", vector_field="v", docs_path=docs_path)
+        backend = MockBackend(idx)
+
+        assert len(backend.store) == 3
+        assert [backend.store.doc_id(i) for i in range(3)] == ["d1", "d22", "d333"]
+        assert backend.store.labels.values == ["a1", "a2"]  # interned once
+
+        # querying with a doc's own vector ranks that doc first
+        hits = backend.search(list(backend.doc_vectors[2]), topn=3)
+        assert (hits[0].doc_id, hits[0].label) == ("d333", "a2")
+        assert [h.score for h in hits] == sorted((h.score for h in hits), reverse=True)
+
+
+def test_mock_backend_filtered_search_scores_allowed_rows_only():
+    with tempfile.TemporaryDirectory() as td:
+        docs_path = os.path.join(td, "docs.jsonl")
+        docs = [
+            {"doc_id": f"d{i}", "answer_id": f"a{i}", "question": f"q {i}", "tenant": f"t{i % 3}"}
+            for i in range(30)
+        ]
+        docs[4]["category"] = ["billing", "account"]
+        with open(docs_path, "w", encoding="utf-8") as f:
+            for d in docs:
+                f.write(json.dumps(d, ensure_ascii=False) + "\n")
+
+        idx = IndexCfg(
+            name="test",
+            backend="mock",
+            vector_field="v",
+            docs_path=docs_path,
+            filter_fields=["tenant", "category"],
+        )
+        backend = MockBackend(idx)
+        qvec = list(backend.doc_vectors[0])
+
+        hits = backend.search(qvec, topn=30, filters={"tenant": ["t1"]})
+        assert len(hits) == 10
+        assert all(int(h.doc_id[1:]) % 3 == 1 for h in hits)
+
+        # OR within a field
+        assert len(backend.search(qvec, topn=30, filters={"tenant": ["t1", "t2"]})) == 20
+        # AND across fields, list-valued doc field
+        hits = backend.search(qvec, topn=5, filters={"tenant": ["t1"], "category": ["account"]})
+        assert [h.doc_id for h in hits] == ["d4"]
+        # unknown value -> no rows
+        assert backend.search(qvec, topn=5, filters={"tenant": ["nope"]}) == []
+
+        # filtered ranking == unfiltered ranking restricted to the allowed rows
+        full = backend.search(qvec, topn=30)
+        assert [h.doc_id for h in backend.search(qvec, topn=5, filters={"tenant": ["t2"]})] == [
+            h.doc_id for h in full if int(h.doc_id[1:]) % 3 == 2
+        ][:5]
+
+        with pytest.raises(ValueError):
+            backend.search(qvec, topn=5, filters={"region": ["kr"]})
+
+
+def test_mock_backend_search_honors_deadline(monkeypatch):
+    import obrbr.search.mock_backend as mock_backend
+
+    with tempfile.TemporaryDirectory() as td:
+        docs_path = os.path.join(td, "docs.jsonl")
+        with open(docs_path, "w", encoding="utf-8") as f:
+            for i in range(50):
+                f.write(json.dumps({"doc_id": f"d{i}", "answer_id": "a", "question": f"q {i}"}))
+                f.write("\n")
+        backend = MockBackend(
+            IndexCfg(name="t", backend="mock", vector_field="v", docs_path=docs_path)
+        )
+        qvec = list(backend.doc_vectors[0])
+
+        assert len(backend.search(qvec, topn=3, timeout=60.0)) == 3
+        with pytest.raises(TimeoutError):
+            backend.search(qvec, topn=3, timeout=0.0)
+
+        # the deadline is checked between chunks, not only up front
+        monkeypatch.setattr(mock_backend, "_CHUNK", 10)
+        ticks = iter([0.0, 0.0, 0.0, 5.0])  # start, chunk 1, chunk 2, chunk 3 (past deadline)
+        monkeypatch.setattr(mock_backend, "time", SimpleNamespace(monotonic=lambda: next(ticks)))
+        with pytest.raises(TimeoutError):
+            backend.search(qvec, topn=3, timeout=1.0)
+
+
+def test_filter_values_use_json_spelling_for_bool_and_null():
+    from obrbr.runner import _query_filters
+    from obrbr.search.doc_store import FilterIndex
+
+    filters = _query_filters({"filters": {"flag": True, "n": [1, None]}}, "filters")
+    assert filters == {"flag": ["true"], "n": ["1", "null"]}  # what ES accepts, not "True"
+
+    index = FilterIndex(["flag"])
+    index.add(0, {"flag": True})
+    index.add(1, {"flag": False})
+    index.build()
+    assert index.rows(index.allowed({"flag": filters["flag"]})) == [0]
@@ -0,0 +1,94 @@
+import json
+import logging
+import time
+
+from obrbr.progress import ProgressReporter
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.t = 0.0
+
+    def __call__(self) -> float:
+        return self.t
+
+
+def test_progress_emits_on_interval_with_running_recall(tmp_path):
+    clock = _Clock()
+    path = tmp_path / "progress.jsonl"
+    p = ProgressReporter(
+        path=str(path),
+        logger=logging.getLogger("obrbr.test"),
+        k_list=[1, 3],
+        total_queries=8,
+        interval_sec=1.0,
+        clock=clock,
+        heartbeat=False,
+    )
+    p.start_pair("idx", "A", 4)
+    for i, ranked in enumerate([["a"], ["x", "a"], ["a"], ["x"]]):
+        clock.t += 0.5
+        p.update(ranked, {"a"})
+        if i == 1:
+            # 2 queries in 1s -> first interval emit
+            assert len(path.read_text(encoding="utf-8").splitlines()) == 1
+    p.finish_pair("pair_done")
+    p.close()
+
+    lines = [json.loads(x) for x in path.read_text(encoding="utf-8").splitlines()]
+    first, last = lines[0], lines[-1]
+    assert (first["done"], first["qps"], first["eta_sec"]) == (2, 2.0, 1.0)
+    assert first["recall@1"] == 0.5 and first["recall@3"] == 1.0
+    assert last["event"] == "pair_done"
+    assert (last["done"], last["run_done"], last["run_total"]) == (4, 4, 8)
+    assert last["recall@1"] == 0.5 and last["recall@3"] == 0.75
+    assert last["run_eta_sec"] == 2.0
+
+
+def test_progress_qps_is_windowed_and_heartbeat_reports_stalls(tmp_path):
+    clock = _Clock()
+    path = tmp_path / "progress.jsonl"
+    p = ProgressReporter(
+        path=str(path),
+        logger=logging.getLogger("obrbr.test"),
+        k_list=[1],
+        total_queries=10,
+        interval_sec=1.0,
+        clock=clock,
+        heartbeat=False,
+    )
+    p.start_pair("idx", "A", 10)
+    for _ in range(4):  # 4 queries in the first 1s
+        clock.t += 0.25
+        p.update(["a"], {"a"})
+    clock.t += 1.0  # 1 query in the next 1s
+    p.update(["a"], {"a"})
+    clock.t += 1.0  # stall: nothing finished
+    stalled = p.emit("progress")
+    p.close()
+
+    fast, slow = (json.loads(x) for x in path.read_text(encoding="utf-8").splitlines()[:2])
+    assert (fast["qps"], fast["eta_sec"]) == (4.0, 1.5)
+    assert (slow["qps"], slow["qps_avg"], slow["eta_sec"]) == (1.0, 2.5, 5.0)
+    assert (stalled["qps"], stalled["eta_sec"], stalled["run_eta_sec"]) == (0.0, None, None)
+
+    # real clock: the heartbeat emits during a pair although no query ever completes
+    path = tmp_path / "beat.jsonl"
+    p = ProgressReporter(
+        path=str(path),
+        logger=logging.getLogger("obrbr.test"),
+        k_list=[1],
+        total_queries=1,
+        interval_sec=0.05,
+    )
+    time.sleep(0.2)  # no pair yet (backend loading): silent
+    assert path.read_text(encoding="utf-8") == ""
+    p.start_pair("idx", "A", 1)
+    time.sleep(0.3)
+    p.finish_pair("pair_failed")
+    time.sleep(0.2)  # between pairs: silent again
+    p.close()
+    *beats, last = (json.loads(x) for x in path.read_text(encoding="utf-8").splitlines())
+    assert beats and all(b["done"] == 0 and b["qps"] == 0.0 for b in beats)
+    assert all(b["event"] == "progress" and b["index"] == "idx" for b in beats)
+    assert last["event"] == "pair_failed"
@@ -0,0 +1,37 @@
+import math
+
+from obrbr.metrics import recall_table
+from obrbr.rankings import (
+    RankingTable,
+    load_rankings,
+    load_run_rankings,
+    rankings_path,
+    write_rankings,
+)
+from obrbr.search.backend_base import SearchHit
+
+
+def _hits(*labels: str) -> list[SearchHit]:
+    return [
+        SearchHit(doc_id=f"d{i}", label=lab, score=1.0 - i * 0.1) for i, lab in enumerate(labels)
+    ]
+
+
+def test_rankings_roundtrip(tmp_path):
+    t = RankingTable(index="idx", model="A", topn=3)
+    t.append("q1", {"a"}, _hits("a", "b", "c"))
+    t.append("질문2", {"x", "c"}, _hits("b", "c"))  # short ranking, multi truth, non-ascii id
+
+    path = rankings_path(str(tmp_path), "idx", "A")
+    write_rankings(path, t)
+    loaded = load_rankings(path)
+
+    assert (loaded.index, loaded.model, loaded.topn) == ("idx", "A", 3)
+    assert loaded.query_ids == ["q1", "질문2"]
+    assert loaded.ranked_labels(1) == ["b", "c"]
+    assert loaded.truth(1) == {"x", "c"}
+    assert math.isnan(loaded.scores[5])
+    assert abs(loaded.scores[0] - 1.0) < 1e-6
+    assert loaded.recall([1, 2]) == recall_table(t.to_evals(), [1, 2]) == {1: 0.5, 2: 1.0}
+
+    assert list(load_run_rankings(str(tmp_path))) == [("idx", "A")]
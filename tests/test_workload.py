@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from obrbr.config import IndexCfg
+from obrbr.search.mock_backend import MockBackend
+from obrbr.workload import WorkloadGenerator, WorkloadSpec, generate_workload
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_generate_workload_schema_and_determinism(tmp_path):
+    spec = WorkloadSpec(
+        docs=500, queries=50, labels=40, dup_ratio=0.2, near_dup_ratio=0.2, truth_max=3
+    )
+    docs_path, queries_path = generate_workload(spec, str(tmp_path / "a"))
+    generate_workload(spec, str(tmp_path / "b"))
+
+    docs, queries = _read(docs_path), _read(queries_path)
+    assert len(docs) == 500 and len(queries) == 50
+    assert set(docs[0]) == {"doc_id", "answer_id", "question"}
+    assert set(queries[0]) == {"query_id", "question", "answer_ids"}
+    assert all(1 <= len(q["answer_ids"]) <= 3 for q in queries)
+    assert len({d["answer_id"] for d in docs}) <= 40
+
+    texts = [d["question"] for d in docs]
+    assert len(set(texts)) < len(texts)  # exact duplicates present
+    assert docs == _read(str(tmp_path / "b" / "docs.jsonl"))
+
+    # loads as a mock index
+    backend = MockBackend(
+        IndexCfg(name="syn", backend="mock", vector_field="v", docs_path=docs_path)
+    )
+    assert len(backend.store) == 500
+
+
+def test_duplicate_keeps_source_label():
+    gen = WorkloadGenerator(WorkloadSpec(docs=200, queries=0, labels=50, dup_ratio=1.0))
+    by_text: dict[str, set[str]] = {}
+    for i in range(200):
+        d = gen.doc(i)
+        by_text.setdefault(d["question"], set()).add(d["answer_id"])
+    assert all(len(labels) == 1 for labels in by_text.values())
+
+
+def test_duplicate_fraction_matches_dup_ratio():
+    # near_dup_ratio=0: identical perturbations of one source would also count as exact dups
+    spec = WorkloadSpec(docs=3000, queries=0, labels=100, dup_ratio=0.3)
+    gen = WorkloadGenerator(spec)
+    seen: set[str] = set()
+    dups = 0
+    for i in range(spec.docs):
+        text = gen.doc(i)["question"]
+        dups += text in seen
+        seen.add(text)
+    assert abs(dups / spec.docs - spec.dup_ratio) < 0.03
+
+
+def test_workload_spec_validation():
+    with pytest.raises(ValueError):
+        WorkloadGenerator(WorkloadSpec(docs=10, queries=1, labels=2, truth_min=1, truth_max=3))
+    with pytest.raises(ValueError):
+        WorkloadGenerator(
+            WorkloadSpec(docs=10, queries=1, labels=2, dup_ratio=0.7, near_dup_ratio=0.5)
+        )